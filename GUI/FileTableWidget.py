@@ -1,6 +1,166 @@
 import os
+import re
+import mmap
+import collections
 from PyQt5 import QtWidgets, QtCore, QtGui
-from PyQt5.QtWidgets import QTableWidgetItem, QComboBox, QPushButton, QMessageBox
+from PyQt5.QtWidgets import QTableWidgetItem, QComboBox, QMessageBox
+
+# Files smaller than this are read directly; mapping them costs more than it saves.
+MMAP_MIN_SIZE = 4 * 1024
+
+# Files at least this large are counted from raw 64 KiB reads instead of being mapped whole.
+STREAM_COUNT_MIN_SIZE = 2 * 1024 * 1024
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Number of scanned files delivered to the table per batch.
+SCAN_BATCH_SIZE = 256
+
+# Log view limits: oldest lines are dropped past LOG_MAX_BLOCKS; appends are coalesced per interval.
+LOG_MAX_BLOCKS = 2000
+LOG_FLUSH_INTERVAL_MS = 50
+
+# Characters of file content shown by preview_prompt.
+PREVIEW_CHARS = 300
+
+# Matches once per line that contains at least one non-whitespace character.
+_CODE_LINE_RE = re.compile(rb"(?m)^[ \t\r\f\v]*\S")
+# Any byte that makes a (newline-free) line segment count as code.
+_NON_WS_RE = re.compile(rb"[^ \t\r\f\v]")
+
+
+def count_code_lines(file_path):
+    """
+    Count non-blank lines in a file without decoding it or splitting it into lines.
+    Small files are read as bytes in one call, mid-sized files are memory-mapped and
+    very large files are streamed in fixed-size chunks. Each path is a regex pass over raw bytes.
+    """
+    size = os.path.getsize(file_path)
+    if size >= STREAM_COUNT_MIN_SIZE:
+        return _stream_count_code_lines(file_path)
+
+    if not hasattr(mmap, "ACCESS_READ") or size < MMAP_MIN_SIZE:
+        with open(file_path, "rb") as f:
+            data = f.read()
+        return len(_CODE_LINE_RE.findall(data))
+
+    with open(file_path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return len(_CODE_LINE_RE.findall(mm))
+
+
+def _stream_count_code_lines(file_path):
+    """
+    Chunked variant of count_code_lines. Only whether the unfinished last line
+    has code so far is carried into the next chunk, not the line itself.
+    """
+    count = 0
+    pending = False
+    with open(file_path, "rb", buffering=0) as f:
+        while True:
+            chunk = f.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            first = chunk.find(b"\n")
+            if first < 0:
+                pending = pending or _NON_WS_RE.search(chunk) is not None
+                continue
+            if pending or _NON_WS_RE.search(chunk, 0, first):
+                count += 1
+            last = chunk.rfind(b"\n")
+            count += len(_CODE_LINE_RE.findall(chunk, first + 1, last + 1))
+            pending = _NON_WS_RE.search(chunk, last + 1) is not None
+    if pending:
+        count += 1
+    return count
+
+
+def iter_py_files(root):
+    """
+    Yield paths of .py files under root. Uses os.scandir directly so the name test
+    and path come from the DirEntry, without a join or stat per file.
+    Unreadable directories are skipped, as os.walk does.
+    """
+    pending = [root]
+    while pending:
+        try:
+            with os.scandir(pending.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                    elif entry.name.endswith(".py"):
+                        yield entry.path
+        except OSError:
+            continue
+
+
+class FileScanSignals(QtCore.QObject):
+    """Signals emitted by FileScanWorker (QRunnable cannot define signals itself)."""
+    files_ready = QtCore.pyqtSignal(list)       # [(file path, line count), ...]
+    file_failed = QtCore.pyqtSignal(str, str)   # file path, error message
+
+
+class FileScanWorker(QtCore.QRunnable):
+    """
+    QRunnable that expands dropped folders and counts lines of .py files off the GUI thread.
+    Results are delivered through FileScanSignals; row insertion stays on the GUI thread.
+    """
+    def __init__(self, paths):
+        super().__init__()
+        self.paths = list(paths)
+        self.signals = FileScanSignals()
+
+    def run(self):
+        batch = []
+        for file_path in self._iter_files():
+            try:
+                batch.append((file_path, count_code_lines(file_path)))
+            except Exception as e:
+                self.signals.file_failed.emit(file_path, str(e))
+                continue
+            if len(batch) >= SCAN_BATCH_SIZE:
+                self.signals.files_ready.emit(batch)
+                batch = []
+        if batch:
+            self.signals.files_ready.emit(batch)
+
+    def _iter_files(self):
+        for path in self.paths:
+            if os.path.isdir(path):
+                yield from iter_py_files(path)
+            elif path.endswith(".py"):
+                yield path
+
+
+class ButtonDelegate(QtWidgets.QStyledItemDelegate):
+    """
+    Paints a push button in every cell of a column and emits clicked(row) on release,
+    so the table needs no per-row QPushButton widgets.
+    """
+    clicked = QtCore.pyqtSignal(int)
+
+    def __init__(self, text, parent=None):
+        super().__init__(parent)
+        self.text = text
+
+    def paint(self, painter, option, index):
+        button = QtWidgets.QStyleOptionButton()
+        button.rect = option.rect.adjusted(2, 2, -2, -2)
+        button.text = self.text
+        button.state = QtWidgets.QStyle.State_Enabled
+        style = option.widget.style() if option.widget else QtWidgets.QApplication.style()
+        style.drawControl(QtWidgets.QStyle.CE_PushButton, button, painter, option.widget)
+
+    def editorEvent(self, event, model, option, index):
+        if (event.type() == QtCore.QEvent.MouseButtonRelease
+                and event.button() == QtCore.Qt.LeftButton
+                and option.rect.contains(event.pos())):
+            self.clicked.emit(index.row())
+            return True
+        return super().editorEvent(event, model, option, index)
+
+    def createEditor(self, parent, option, index):
+        return None
+
 
 class FileTableWidget(QtWidgets.QTableWidget):
     def __init__(self, helpers=None):
@@ -18,9 +178,29 @@ class FileTableWidget(QtWidgets.QTableWidget):
         # Stretch last column for UI balance
         self.horizontalHeader().setStretchLastSection(True)
 
+        # Preview column is painted by a delegate instead of a QPushButton per row
+        self.preview_delegate = ButtonDelegate("Preview", self)
+        self.preview_delegate.clicked.connect(self.preview_prompt)
+        self.setItemDelegateForColumn(3, self.preview_delegate)
+
         # Log output widget for external access
         self.log_output = QtWidgets.QPlainTextEdit()
         self.log_output.setReadOnly(True)
+        self.log_output.setMaximumBlockCount(LOG_MAX_BLOCKS)
+        self.log_output.setUndoRedoEnabled(False)
+
+        # Buffered log lines, flushed to log_output in one append per timer tick
+        self._pending_logs = collections.deque()
+        self._log_flush_timer = QtCore.QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+
+        # Single model shared by every Model Selection combo (customize list as needed)
+        self._model_choices = QtCore.QStringListModel(["o3mini", "o4", "o5"], self)  # Placeholder list
+
+        # Background pool for scanning dropped files/folders
+        self.threadpool = QtCore.QThreadPool()
 
     # ------------------------------
     # Drag & Drop Handlers
@@ -33,12 +213,8 @@ class FileTableWidget(QtWidgets.QTableWidget):
 
     def dropEvent(self, event):
         if event.mimeData().hasUrls():
-            for url in event.mimeData().urls():
-                file_path = url.toLocalFile()
-                if os.path.isdir(file_path):
-                    self.add_folder_files(file_path)
-                elif file_path.endswith(".py"):
-                    self.add_file(file_path)
+            paths = [url.toLocalFile() for url in event.mimeData().urls()]
+            self.scan_paths_async(paths)
             event.acceptProposedAction()
         else:
             super().dropEvent(event)
@@ -46,44 +222,63 @@ class FileTableWidget(QtWidgets.QTableWidget):
     # ------------------------------
     # Adding Files / Folders
     # ------------------------------
+    def scan_paths_async(self, paths):
+        """Count lines for files/folders on the thread pool; rows are added in batches as results arrive."""
+        worker = FileScanWorker(paths)
+        worker.signals.files_ready.connect(self._insert_file_rows)
+        worker.signals.file_failed.connect(
+            lambda path, error: self.log(f"❌ Failed to read file {path}: {error}")
+        )
+        self.threadpool.start(worker)
+
     def add_folder_files(self, folder_path):
-        for root, _, files in os.walk(folder_path):
-            for file in files:
-                if file.endswith(".py"):
-                    full_path = os.path.join(root, file)
-                    self.add_file(full_path)
+        self.scan_paths_async([folder_path])
 
     def add_file(self, file_path):
-        # Read file and calculate line count
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                lines = f.readlines()
-            line_count = len([line for line in lines if line.strip()])
-        except Exception as e:
-            self.log(f"❌ Failed to read file {file_path}: {e}")
-            return
+        self.add_files_bulk([file_path])
 
-        # Insert new row
-        row_position = self.rowCount()
-        self.insertRow(row_position)
+    def add_files_bulk(self, file_paths):
+        """Read and count each file, then insert all rows in a single batched update."""
+        entries = []
+        for file_path in file_paths:
+            try:
+                entries.append((file_path, count_code_lines(file_path)))
+            except Exception as e:
+                self.log(f"❌ Failed to read file {file_path}: {e}")
+        self._insert_file_rows(entries)
 
-        # File Path Item
-        self.setItem(row_position, 0, QTableWidgetItem(file_path))
+    def _insert_file_rows(self, entries):
+        if not entries:
+            return
 
-        # Line Count Item
-        self.setItem(row_position, 1, QTableWidgetItem(str(line_count)))
+        # Suspend sorting, repaints and signals so N rows cost one layout pass
+        sorting_enabled = self.isSortingEnabled()
+        self.setSortingEnabled(False)
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        try:
+            first_row = self.rowCount()
+            self.setRowCount(first_row + len(entries))
 
-        # Model Selection ComboBox (customize list as needed)
-        model_combo = QComboBox()
-        model_combo.addItems(["o3mini", "o4", "o5"])  # Placeholder list
-        self.setCellWidget(row_position, 2, model_combo)
+            for row_position, (file_path, line_count) in enumerate(entries, start=first_row):
+                # File Path Item
+                self.setItem(row_position, 0, QTableWidgetItem(file_path))
 
-        # Preview Button
-        preview_button = QPushButton("Preview")
-        preview_button.clicked.connect(lambda _, r=row_position: self.preview_prompt(r))
-        self.setCellWidget(row_position, 3, preview_button)
+                # Line Count Item
+                self.setItem(row_position, 1, QTableWidgetItem(str(line_count)))
 
-        self.log(f"✅ File added: {file_path} ({line_count} lines)")
+                # Model Selection ComboBox backed by the shared choices model
+                model_combo = QComboBox()
+                model_combo.setModel(self._model_choices)
+                self.setCellWidget(row_position, 2, model_combo)
+        finally:
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+            self.setSortingEnabled(sorting_enabled)
+            self.viewport().update()
+
+        for file_path, line_count in entries:
+            self.log(f"✅ File added: {file_path} ({line_count} lines)")
 
     # ------------------------------
     # Preview Prompt
@@ -98,14 +293,18 @@ class FileTableWidget(QtWidgets.QTableWidget):
         manual_model = model_combo.currentText() if model_combo else "Unknown"
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            # Only the head of the file is shown, so only the head is read and decoded
+            # (one extra character tells us whether to append an ellipsis)
+            with open(file_path, "r", encoding="utf-8", errors="replace") as f:
+                snippet = f.read(PREVIEW_CHARS + 1)
+            truncated = len(snippet) > PREVIEW_CHARS
+            snippet = snippet[:PREVIEW_CHARS]
 
             preview = (
                 f"Preview for file: {file_path}\n"
                 f"Selected Model: {manual_model}\n"
                 f"---\n"
-                f"{content[:300]}{'...' if len(content) > 300 else ''}"
+                f"{snippet}{'...' if truncated else ''}"
             )
 
             QMessageBox.information(self, "Prompt Preview", preview)
@@ -155,7 +354,14 @@ class FileTableWidget(QtWidgets.QTableWidget):
     # Logging Helper
     # ------------------------------
     def log(self, message):
-        self.log_output.appendPlainText(message)
+        self._pending_logs.append(message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
         if self.helpers:
             self.helpers.update_status_bar(self.window(), message)
             self.helpers.logger.info(message)
+
+    def _flush_log(self):
+        if self._pending_logs:
+            self.log_output.appendPlainText("\n".join(self._pending_logs))
+            self._pending_logs.clear()
@@ -79,6 +79,25 @@ class GuiHelpers:
             self.logger.error(f"❌ Failed to save file {file_path}: {e}")
             return False
 
+    def save_file_fast(self, file_path, content):
+        """
+        Save content to a file with raw os.open/os.write calls, skipping the buffered text layer.
+        Not fsync'd; meant for transient files such as generated tests.
+        """
+        try:
+            data = memoryview(content.encode("utf-8"))
+            fd = os.open(file_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+            try:
+                while data:
+                    data = data[os.write(fd, data):]
+            finally:
+                os.close(fd)
+            self.logger.info(f"✅ File saved: {file_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"❌ Failed to save file {file_path}: {e}")
+            return False
+
     # -------------------------------
     # CONFIRMATION & ALERTS
     # -------------------------------
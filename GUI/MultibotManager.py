@@ -1,11 +1,27 @@
 import queue
 import threading
 import time
-from bot_worker import BotWorker
+import multiprocessing
+from bot_worker import BotWorker, BotProcess
+
+# Marks the end of the results currently in results_queue during a drain.
+_SENTINEL = object()
+
+# Minimum seconds between status_callback dispatches (final and forced updates always go out).
+PROGRESS_EMIT_INTERVAL = 0.1
+
+# Seconds between worker liveness checks while waiting on tasks or results.
+WORKER_POLL_INTERVAL = 1.0
 
 class MultibotManager:
     """
-    Manages a pool of BotWorker threads to process tasks asynchronously.
+    Manages a pool of bots to process tasks asynchronously: BotWorker threads by default,
+    or BotProcess workers with use_processes=True, so bots run truly in parallel (everything
+    handed to the workers must then be picklable).
+
+    Workers are expected to run until shutdown(); if one stops early (e.g. its login failed),
+    wait_for_completion() and get_all_results() raise RuntimeError instead of waiting for
+    tasks it will never finish.
 
     Usage:
         with MultibotManager(scanner, num_workers=4, status_callback=gui_callback) as manager:
@@ -14,9 +30,20 @@ class MultibotManager:
             results = manager.get_all_results()
     """
 
-    def __init__(self, scanner=None, num_workers=4, status_callback=None, auto_start=True):
-        self.task_queue = queue.Queue()
-        self.results_queue = queue.Queue()
+    def __init__(self, scanner=None, num_workers=4, status_callback=None, auto_start=True, use_processes=False):
+        self.use_processes = use_processes
+        if use_processes:
+            self.task_queue = multiprocessing.JoinableQueue()
+            self.results_queue = multiprocessing.Queue()
+            # Worker status updates cross the process boundary here; drained by _status_listener
+            self.status_queue = multiprocessing.Queue()
+        else:
+            self.task_queue = queue.Queue()
+            self.results_queue = queue.Queue()
+            self.status_queue = None
+        self._status_listener = None
+        self._results_retrieved = 0
+        self._worker_errors = {}  # worker name -> error from its "fatal" status update
 
         self.scanner = scanner
         self.status_callback = status_callback
@@ -35,17 +62,37 @@ class MultibotManager:
         self.total_tasks = 0
         self.completed_tasks = 0
         self.start_time = None
+        self._last_emit = 0.0
 
         if auto_start:
             self.start_workers()
 
     def start_workers(self):
-        """Launch BotWorker threads."""
+        """Launch BotProcess workers (or BotWorker threads)."""
         with self._lock:
             if self._started:
                 print("⚠️ Workers already started.")
                 return
 
+            if self.use_processes:
+                self.workers = [
+                    BotProcess(
+                        task_queue=self.task_queue,
+                        results_queue=self.results_queue,
+                        status_queue=self.status_queue,
+                        bot_id=i,
+                        profile_dir=self.profile_dir
+                    )
+                    for i in range(self.num_workers)
+                ]
+                for worker in self.workers:
+                    worker.start()
+                self._status_listener = threading.Thread(target=self._drain_status_queue, daemon=True)
+                self._status_listener.start()
+                self._started = True
+                print(f"🚀 {self.num_workers} worker processes started.")
+                return
+
             self.workers = [
                 BotWorker(
                     task_queue=self.task_queue,
@@ -69,12 +116,12 @@ class MultibotManager:
             return
 
         self.task_queue.put(task)
-        self.total_tasks += 1
+        with self._lock:
+            self.total_tasks += 1
+            if not self.start_time:
+                self.start_time = time.time()
         print(f"📝 Task added: {task}")
 
-        if not self.start_time:
-            self.start_time = time.time()
-
         self._update_progress()
 
     def wait_for_completion(self):
@@ -83,19 +130,41 @@ class MultibotManager:
             raise RuntimeError("Workers not started. Call start_workers() first.")
 
         print("⏳ Waiting for task completion...")
-        self.task_queue.join()
+        # join() has no timeout, so it runs on a helper thread while workers are checked
+        joiner = threading.Thread(target=self.task_queue.join, daemon=True)
+        joiner.start()
+        while joiner.is_alive():
+            joiner.join(WORKER_POLL_INTERVAL)
+            if joiner.is_alive():
+                self._check_workers()
         self._update_progress(force=True)
         print("✅ All tasks processed.")
 
     def get_all_results(self):
-        """Retrieve all task results."""
+        """
+        Retrieve all task results.
+        Call after wait_for_completion(): workers enqueue each result before marking
+        its task done, so a sentinel put now lands behind every finished result.
+        Progress is already counted by the workers' "progress" updates.
+        With worker processes a sentinel cannot be ordered against results still being
+        flushed from the workers' queue feeders, so instead exactly one result per
+        task added so far (and not yet retrieved) is collected.
+        """
         results = []
-        while not self.results_queue.empty():
-            task, result = self.results_queue.get()
+        if self.use_processes:
+            with self._lock:
+                pending = self.total_tasks - self._results_retrieved
+            items = (self._get_result() for _ in range(pending))
+        else:
+            self.results_queue.put(_SENTINEL)
+            items = iter(self.results_queue.get, _SENTINEL)
+
+        for task, result in items:
             results.append((task, result))
             print(f"📦 Retrieved result for task: {task}")
-            # Auto-update progress for consistency
-            self.mark_task_complete()
+            if self.use_processes:
+                with self._lock:
+                    self._results_retrieved += 1
 
         return results
 
@@ -117,6 +186,11 @@ class MultibotManager:
             else:
                 print(f"✅ Worker {worker.name} shut down cleanly.")
 
+        if self._status_listener is not None:
+            self.status_queue.put(None)
+            self._status_listener.join(timeout=5)
+            self._status_listener = None
+
         with self._lock:
             self._started = False
 
@@ -129,16 +203,55 @@ class MultibotManager:
         self._update_progress()
 
     def _update_progress(self, force=False):
-        """Update progress and invoke the callback."""
+        """
+        Update progress and invoke the callback.
+        Counters are snapshotted under the lock; dispatches are throttled to one per
+        PROGRESS_EMIT_INTERVAL unless forced or all tasks are complete.
+        """
         if not self.status_callback:
             return
 
-        percent = int((self.completed_tasks / self.total_tasks) * 100) if self.total_tasks else 0
-        elapsed_time = time.time() - self.start_time if self.start_time else 0
-        status_text = f"{self.completed_tasks}/{self.total_tasks} tasks completed in {elapsed_time:.1f}s"
+        with self._lock:
+            completed = self.completed_tasks
+            total = self.total_tasks
+            start_time = self.start_time
+            now = time.monotonic()
+            if not force and completed < total and now - self._last_emit < PROGRESS_EMIT_INTERVAL:
+                return
+            self._last_emit = now
+
+        percent = int((completed / total) * 100) if total else 0
+        elapsed_time = time.time() - start_time if start_time else 0
+        status_text = f"{completed}/{total} tasks completed in {elapsed_time:.1f}s"
 
         self.status_callback(percent, status_text)
 
+    def _get_result(self):
+        """results_queue.get() that raises instead of blocking forever if a worker has died."""
+        while True:
+            try:
+                return self.results_queue.get(timeout=WORKER_POLL_INTERVAL)
+            except queue.Empty:
+                self._check_workers()
+
+    def _check_workers(self):
+        """Raise RuntimeError if any worker stopped before shutdown() was called."""
+        dead = [worker for worker in self.workers if not worker.is_alive()]
+        if not dead:
+            return
+        details = []
+        for worker in dead:
+            error = self._worker_errors.get(worker.name)
+            if error is None and self.use_processes:
+                error = f"exit code {worker.exitcode}"
+            details.append(f"{worker.name} ({error or 'stopped'})")
+        raise RuntimeError(f"❌ Worker(s) stopped before finishing their tasks: {', '.join(details)}")
+
+    def _drain_status_queue(self):
+        """Relay (update_type, payload) tuples from worker processes until a None sentinel."""
+        for update_type, payload in iter(self.status_queue.get, None):
+            self._worker_status_update(update_type, payload)
+
     def _worker_status_update(self, update_type, payload=None):
         """Callback for worker updates."""
         if update_type == "progress":
@@ -147,6 +260,10 @@ class MultibotManager:
         elif update_type == "log":
             print(f"📜 Worker Log: {payload}")
 
+        elif update_type == "fatal":
+            self._worker_errors[payload["worker"]] = payload["error"]
+            print(f"❌ Worker {payload['worker']} failed: {payload['error']}")
+
         # Optional: restart dead workers
         # elif update_type == "error":
         #     self._restart_worker(payload['worker_id'])
@@ -6,10 +6,15 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtCore import Qt, QTimer
 
+# Upper bound on memoized "Last Execution" strings before the cache is reset.
+TIMESTAMP_CACHE_SIZE = 1024
+
 class PluginManagerTab(QWidget):
     def __init__(self, plugin_registry, parent=None):
         super().__init__(parent)
         self.plugin_registry = plugin_registry  # Dict or object managing plugins/models
+        self._last_snapshot = []   # per row: (name, enabled, last_execution, success_rate) last rendered, None forces a rewrite
+        self._ts_cache = {}        # last_execution timestamp -> formatted display string
         self.init_ui()
 
     def init_ui(self):
@@ -34,45 +39,116 @@ class PluginManagerTab(QWidget):
         self.reload_all_btn.clicked.connect(self.reload_all_plugins)
         self.layout.addWidget(self.reload_all_btn)
 
-        # Auto-refresh table every X seconds (optional)
+        # Auto-refresh table every X seconds while the tab is visible.
+        # The timer is started in showEvent and stopped in hideEvent; the table
+        # is populated on first show.
         self.refresh_timer = QTimer(self)
+        self.refresh_timer.setTimerType(Qt.CoarseTimer)
+        self.refresh_timer.setInterval(5000)  # Refresh every 5 seconds
         self.refresh_timer.timeout.connect(self.refresh_table)
-        self.refresh_timer.start(5000)  # Refresh every 5 seconds
 
-        # Initial population
+    def showEvent(self, event):
+        super().showEvent(event)
         self.refresh_table()
+        self.refresh_timer.start()
+
+    def hideEvent(self, event):
+        self.refresh_timer.stop()
+        super().hideEvent(event)
 
     def refresh_table(self):
-        """Update table with latest plugin info."""
-        plugins = self.plugin_registry.get_all_plugins()  # Assumes method returns plugin info dict/list
-        self.plugin_table.setRowCount(len(plugins))
+        """
+        Update table with latest plugin info.
+        Rows follow the registry's plugin order; only rows for added/removed plugins
+        are inserted/removed, and only cells whose values changed since the last
+        refresh are rewritten.
+        """
+        if not self.isVisible():
+            return
+
+        plugins = list(self.plugin_registry.get_all_plugins())  # Assumes method returns plugin info dict/list
+
+        # Drop rows past the end of the plugin list
+        while len(self._last_snapshot) > len(plugins):
+            self.plugin_table.removeRow(len(self._last_snapshot) - 1)
+            self._last_snapshot.pop()
 
         for row, plugin in enumerate(plugins):
-            # Plugin Name
-            name_item = QTableWidgetItem(plugin.get("name", "Unknown"))
-            self.plugin_table.setItem(row, 0, name_item)
-
-            # Enabled Checkbox
-            enabled_chk = QCheckBox()
-            enabled_chk.setChecked(plugin.get("enabled", False))
-            enabled_chk.stateChanged.connect(lambda state, p=plugin: self.toggle_plugin(p, state))
-            self.plugin_table.setCellWidget(row, 1, enabled_chk)
-
-            # Last Execution
-            last_exec_time = plugin.get("last_execution", None)
-            last_exec_display = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(last_exec_time)) if last_exec_time else "Never"
-            last_exec_item = QTableWidgetItem(last_exec_display)
-            self.plugin_table.setItem(row, 2, last_exec_item)
-
-            # Success Rate
-            success_rate = plugin.get("success_rate", 0.0)
-            success_item = QTableWidgetItem(f"{success_rate:.1f}%")
-            self.plugin_table.setItem(row, 3, success_item)
-
-            # Reload Button
-            reload_btn = QPushButton("🔁 Reload")
-            reload_btn.clicked.connect(lambda _, p=plugin: self.reload_plugin(p))
-            self.plugin_table.setCellWidget(row, 4, reload_btn)
+            snapshot = (
+                plugin.get("name", "Unknown"),
+                plugin.get("enabled", False),
+                plugin.get("last_execution", None),
+                plugin.get("success_rate", 0.0),
+            )
+            if row == len(self._last_snapshot):
+                self.plugin_table.insertRow(row)
+                self._create_row(row)
+                self._last_snapshot.append(None)
+
+            previous = self._last_snapshot[row]
+            if previous == snapshot:
+                continue
+
+            self._update_row(row, snapshot, previous)
+            self._last_snapshot[row] = snapshot
+
+    def _create_row(self, row):
+        """Create the widgets (checkbox, reload button) for a new plugin row."""
+        # Enabled Checkbox (row stored on the widget, read back by the shared slot)
+        enabled_chk = QCheckBox()
+        enabled_chk.setProperty("plugin_row", row)
+        enabled_chk.stateChanged.connect(self._on_toggle)
+        self.plugin_table.setCellWidget(row, 1, enabled_chk)
+
+        # Reload Button
+        reload_btn = QPushButton("🔁 Reload")
+        reload_btn.setProperty("plugin_row", row)
+        reload_btn.clicked.connect(self._on_reload)
+        self.plugin_table.setCellWidget(row, 4, reload_btn)
+
+    def _update_row(self, row, snapshot, previous=None):
+        """Write only the cells whose value differs from the previous snapshot."""
+        name, enabled, last_exec_time, success_rate = snapshot
+        prev_name, prev_enabled, prev_exec_time, prev_success = previous or (None, None, object(), None)
+
+        # Plugin Name
+        if name != prev_name:
+            self.plugin_table.setItem(row, 0, QTableWidgetItem(name))
+
+        # Enabled Checkbox (signals blocked so syncing state does not re-trigger toggle_plugin)
+        if enabled != prev_enabled:
+            enabled_chk = self.plugin_table.cellWidget(row, 1)
+            enabled_chk.blockSignals(True)
+            enabled_chk.setChecked(enabled)
+            enabled_chk.blockSignals(False)
+
+        # Last Execution
+        if last_exec_time != prev_exec_time:
+            last_exec_display = self._format_timestamp(last_exec_time) if last_exec_time else "Never"
+            self.plugin_table.setItem(row, 2, QTableWidgetItem(last_exec_display))
+
+        # Success Rate
+        if success_rate != prev_success:
+            self.plugin_table.setItem(row, 3, QTableWidgetItem(f"{success_rate:.1f}%"))
+
+    def _format_timestamp(self, timestamp):
+        """Format a last-execution timestamp, memoized since the same values repeat across refreshes."""
+        display = self._ts_cache.get(timestamp)
+        if display is None:
+            if len(self._ts_cache) >= TIMESTAMP_CACHE_SIZE:
+                self._ts_cache.clear()
+            display = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(timestamp))
+            self._ts_cache[timestamp] = display
+        return display
+
+    def _on_toggle(self, state):
+        """Shared stateChanged slot for every Enabled checkbox."""
+        row = self.sender().property("plugin_row")
+        self.toggle_plugin({"name": self._last_snapshot[row][0], "row": row}, state)
+
+    def _on_reload(self):
+        """Shared clicked slot for every Reload button."""
+        self.reload_plugin({"name": self._last_snapshot[self.sender().property("plugin_row")][0]})
 
     def toggle_plugin(self, plugin, state):
         """Enable or disable a plugin."""
@@ -86,6 +162,9 @@ class PluginManagerTab(QWidget):
                 self.show_message("Plugin Disabled", f"{plugin_name} has been disabled.")
         except Exception as e:
             self.show_message("Error", f"Failed to toggle plugin:\n{e}", error=True)
+            # The checkbox kept the click; force the row to be rewritten from the registry
+            if plugin.get("row") is not None:
+                self._last_snapshot[plugin["row"]] = None
 
         self.refresh_table()
 
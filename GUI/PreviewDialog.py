@@ -5,44 +5,91 @@ from PyQt5 import QtWidgets, QtGui, QtCore
 from PyQt5.QtCore import Qt
 from PyQt5.QtWidgets import (
     QDialog, QVBoxLayout, QPlainTextEdit, QHBoxLayout,
-    QPushButton, QMessageBox, QLabel, QCheckBox, QFileDialog, QTextEdit
+    QPushButton, QMessageBox, QLabel, QCheckBox, QFileDialog
 )
 
+# Diff lines appended to the diff view per signal, and the view's block cap.
+DIFF_BATCH_LINES = 1000
+DIFF_MAX_BLOCKS = 200000
+
 class PythonSyntaxHighlighter(QtGui.QSyntaxHighlighter):
     def __init__(self, document):
         super().__init__(document)
-        self.highlighting_rules = []
-        
+
         # Keywords
-        keyword_format = QtGui.QTextCharFormat()
-        keyword_format.setForeground(Qt.darkBlue)
-        keyword_format.setFontWeight(QtGui.QFont.Bold)
+        self.keyword_format = QtGui.QTextCharFormat()
+        self.keyword_format.setForeground(Qt.darkBlue)
+        self.keyword_format.setFontWeight(QtGui.QFont.Bold)
         keywords = [
             'def', 'class', 'if', 'else', 'elif', 'try', 'except', 'while', 'for',
             'return', 'import', 'from', 'as', 'pass', 'break', 'continue', 'with', 'lambda'
         ]
-        for word in keywords:
-            pattern = QtCore.QRegExp(f"\\b{word}\\b")
-            self.highlighting_rules.append((pattern, keyword_format))
-        
+
         # Strings
-        string_format = QtGui.QTextCharFormat()
-        string_format.setForeground(Qt.darkGreen)
-        self.highlighting_rules.append((QtCore.QRegExp(r'".*"'), string_format))
-        self.highlighting_rules.append((QtCore.QRegExp(r"'.*'"), string_format))
-        
+        self.string_format = QtGui.QTextCharFormat()
+        self.string_format.setForeground(Qt.darkGreen)
+
         # Comments
-        comment_format = QtGui.QTextCharFormat()
-        comment_format.setForeground(Qt.gray)
-        self.highlighting_rules.append((QtCore.QRegExp(r'#.*'), comment_format))
+        self.comment_format = QtGui.QTextCharFormat()
+        self.comment_format.setForeground(Qt.gray)
+
+        # One alternation for all keywords: a single PCRE2 scan per block instead of one per keyword
+        self.highlighting_rules = [
+            (QtCore.QRegularExpression(r"\b(?:" + "|".join(keywords) + r")\b"), self.keyword_format),
+            (QtCore.QRegularExpression(r'".*"'), self.string_format),
+            (QtCore.QRegularExpression(r"'.*'"), self.string_format),
+            (QtCore.QRegularExpression(r'#.*'), self.comment_format),
+        ]
+        for pattern, _ in self.highlighting_rules:
+            pattern.optimize()
 
     def highlightBlock(self, text):
         for pattern, fmt in self.highlighting_rules:
-            index = pattern.indexIn(text)
-            while index >= 0:
-                length = pattern.matchedLength()
-                self.setFormat(index, length, fmt)
-                index = pattern.indexIn(text, index + length)
+            matches = pattern.globalMatch(text)
+            while matches.hasNext():
+                match = matches.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(), fmt)
+
+class DiffSignals(QtCore.QObject):
+    """Signals emitted by DiffWorker (QRunnable cannot define signals itself)."""
+    lines_ready = QtCore.pyqtSignal(list)
+    finished = QtCore.pyqtSignal()
+
+class DiffWorker(QtCore.QRunnable):
+    """
+    QRunnable that computes a unified diff off the GUI thread and emits it
+    in batches of DIFF_BATCH_LINES lines.
+    """
+    def __init__(self, before, after):
+        super().__init__()
+        self.before = before
+        self.after = after
+        self.cancelled = False
+        self.signals = DiffSignals()
+
+    def run(self):
+        # difflib indexes and len()s its inputs, so they must be sequences; split once here
+        # and drop the source strings so only the line lists stay alive while diffing.
+        before_lines = self.before.splitlines()
+        self.before = None
+        after_lines = self.after.splitlines()
+        self.after = None
+
+        diff = difflib.unified_diff(
+            before_lines, after_lines,
+            fromfile='Original', tofile='Updated', lineterm=''
+        )
+        batch = []
+        for line in diff:
+            if self.cancelled:
+                return
+            batch.append(line)
+            if len(batch) >= DIFF_BATCH_LINES:
+                self.signals.lines_ready.emit(batch)
+                batch = []
+        if batch:
+            self.signals.lines_ready.emit(batch)
+        self.signals.finished.emit()
 
 class PreviewDialog(QDialog):
     def __init__(self, file_path, updated_content, parent=None):
@@ -150,23 +197,48 @@ class PreviewDialog(QDialog):
             self.show_message("Error", f"Failed to save override:\n{e}", error=True)
 
     def backup_file(self, original_file):
-        if not os.path.exists(self.backup_dir):
-            os.makedirs(self.backup_dir)
+        os.makedirs(self.backup_dir, exist_ok=True)
 
         base_name = os.path.basename(original_file)
-        backup_file_path = os.path.join(self.backup_dir, base_name)
+        with os.scandir(self.backup_dir) as entries:
+            existing = {entry.name for entry in entries}
 
+        # Pick the first free name from one directory listing, then claim it atomically
+        candidate = base_name
         version = 1
-        while os.path.exists(backup_file_path):
-            backup_file_path = os.path.join(self.backup_dir, f"{base_name}_v{version}")
-            version += 1
-
-        shutil.copy2(original_file, backup_file_path)
+        while True:
+            while candidate in existing:
+                candidate = f"{base_name}_v{version}"
+                version += 1
+            backup_file_path = os.path.join(self.backup_dir, candidate)
+            try:
+                fd = os.open(backup_file_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+            except FileExistsError:
+                existing.add(candidate)
+                continue
+            os.close(fd)
+            break
+
+        # Backups only need the bytes; copyfile skips the metadata stat/utime/chmod
+        # calls and uses the kernel fast-copy path (sendfile etc.) where available.
+        try:
+            shutil.copyfile(original_file, backup_file_path)
+        except BaseException:
+            # Don't leave the empty placeholder behind looking like a real backup
+            try:
+                os.remove(backup_file_path)
+            except OSError:
+                pass
+            raise
         self.show_message("Backup Created", f"Backup saved at:\n{backup_file_path}")
 
     def copy_to_clipboard(self):
-        clipboard = QtWidgets.QApplication.clipboard()
-        clipboard.setText(self.after_editor.toPlainText())
+        # Copy inside Qt (document -> clipboard) instead of round-tripping through a Python str,
+        # then restore the user's cursor/selection.
+        cursor = self.after_editor.textCursor()
+        self.after_editor.selectAll()
+        self.after_editor.copy()
+        self.after_editor.setTextCursor(cursor)
         self.show_message("Copied", "Content copied to clipboard.")
 
     def toggle_word_wrap(self, checked):
@@ -189,19 +261,16 @@ class PreviewDialog(QDialog):
             return ""
 
     def show_diff(self):
-        before = self.before_editor.toPlainText().splitlines()
-        after = self.after_editor.toPlainText().splitlines()
-        diff = difflib.unified_diff(before, after, fromfile='Original', tofile='Updated', lineterm='')
-        diff_output = "\n".join(diff)
-
         diff_dialog = QDialog(self)
-        diff_dialog.setWindowTitle("File Differences")
+        diff_dialog.setWindowTitle("File Differences (computing...)")
         diff_dialog.resize(800, 600)
         layout = QVBoxLayout(diff_dialog)
 
-        diff_text = QTextEdit(diff_dialog)
-        diff_text.setPlainText(diff_output)
+        # Plain-text view filled incrementally as the worker produces diff batches
+        diff_text = QPlainTextEdit(diff_dialog)
         diff_text.setReadOnly(True)
+        diff_text.setUndoRedoEnabled(False)
+        diff_text.setMaximumBlockCount(DIFF_MAX_BLOCKS)
 
         layout.addWidget(diff_text)
 
@@ -209,5 +278,11 @@ class PreviewDialog(QDialog):
         close_btn.clicked.connect(diff_dialog.accept)
         layout.addWidget(close_btn)
 
+        worker = DiffWorker(self.before_editor.toPlainText(), self.after_editor.toPlainText())
+        worker.signals.lines_ready.connect(lambda lines: diff_text.appendPlainText("\n".join(lines)))
+        worker.signals.finished.connect(lambda: diff_dialog.setWindowTitle("File Differences"))
+        QtCore.QThreadPool.globalInstance().start(worker)
+
         diff_dialog.exec_()
+        worker.cancelled = True
 
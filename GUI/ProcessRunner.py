@@ -0,0 +1,87 @@
+import io
+import os
+import selectors
+import subprocess
+import threading
+import time
+from collections import deque
+
+# Only the last TAIL_CHUNKS reads of each stream are kept; earlier output is discarded.
+TAIL_CHUNKS = 1024
+READ_CHUNK_SIZE = 64 * 1024
+
+
+def run_process(cmd, timeout=None, tail_chunks=TAIL_CHUNKS):
+    """
+    Run a command and return (returncode, stdout, stderr), like subprocess.run with capture_output,
+    but output is drained as raw bytes into bounded ring buffers so runaway output cannot exhaust
+    memory. Each stream is decoded once, as UTF-8 with replacement, after the process exits.
+
+    Raises subprocess.TimeoutExpired (after killing the process) if timeout seconds elapse.
+    """
+    proc = subprocess.Popen(
+        cmd,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=io.DEFAULT_BUFFER_SIZE,
+    )
+    tails = {proc.stdout: deque(maxlen=tail_chunks), proc.stderr: deque(maxlen=tail_chunks)}
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    try:
+        if os.name == "nt":
+            # Windows selectors only accept sockets, so each pipe gets a reader thread
+            _drain_with_threads(tails, deadline)
+        else:
+            _drain_with_selector(tails, deadline)
+        proc.wait(timeout=_remaining(deadline))
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+        raise subprocess.TimeoutExpired(cmd, timeout)
+    finally:
+        for pipe in tails:
+            pipe.close()
+
+    return (
+        proc.returncode,
+        b"".join(tails[proc.stdout]).decode("utf-8", errors="replace"),
+        b"".join(tails[proc.stderr]).decode("utf-8", errors="replace"),
+    )
+
+
+def _remaining(deadline):
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0)
+
+
+def _drain_with_selector(tails, deadline):
+    with selectors.DefaultSelector() as selector:
+        for pipe in tails:
+            selector.register(pipe, selectors.EVENT_READ)
+        while selector.get_map():
+            remaining = _remaining(deadline)
+            if remaining == 0:
+                raise subprocess.TimeoutExpired(None, None)
+            for key, _ in selector.select(remaining):
+                chunk = os.read(key.fd, READ_CHUNK_SIZE)
+                if chunk:
+                    tails[key.fileobj].append(chunk)
+                else:
+                    selector.unregister(key.fileobj)
+
+
+def _drain_with_threads(tails, deadline):
+    def drain(pipe, tail):
+        for chunk in iter(lambda: pipe.read1(READ_CHUNK_SIZE), b""):
+            tail.append(chunk)
+
+    readers = [threading.Thread(target=drain, args=item, daemon=True) for item in tails.items()]
+    for reader in readers:
+        reader.start()
+    for reader in readers:
+        reader.join(_remaining(deadline))
+        if reader.is_alive():
+            raise subprocess.TimeoutExpired(None, None)
@@ -1,67 +1,183 @@
+import io
 import os
-import subprocess
-import time
+import sys
+import threading
+import traceback
+import contextlib
+import collections
+import itertools
+from pathlib import Path
+import concurrent.futures
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from PyQt5 import QtWidgets, QtCore
 from GUI.GuiHelpers import GuiHelpers
+from GUI.ProcessRunner import run_process
 from OpenAIClient import OpenAIClient  # Use the new client class
 
+def _run_file(file_path):
+    """
+    Execute a Python file as __main__ inside a pool worker process, approximating `python file_path`.
+    Returns (returncode, stdout, stderr).
+
+    sys.argv, sys.path, the working directory and modules the script imported are restored
+    afterwards, but threads, atexit hooks and other process-wide state it leaves behind persist
+    in the worker, and output written by C code or subprocesses is not captured. Only used
+    with SelfHealController(pooled_runs=True).
+    """
+    stdout, stderr = io.StringIO(), io.StringIO()
+    returncode = 0
+    script_dir = os.path.dirname(os.path.abspath(file_path))
+    preloaded_modules = set(sys.modules)
+    saved_argv, saved_path, saved_cwd = sys.argv, list(sys.path), os.getcwd()
+    sys.argv = [file_path]
+    sys.path.insert(0, script_dir)
+    try:
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            try:
+                with open(file_path, "r", encoding="utf-8") as f:
+                    code = compile(f.read(), file_path, "exec")
+                exec(code, {"__name__": "__main__", "__file__": file_path})
+            except SystemExit as e:
+                if e.code is None or isinstance(e.code, int):
+                    returncode = e.code or 0
+                else:
+                    print(e.code, file=sys.stderr)
+                    returncode = 1
+            except BaseException:
+                traceback.print_exc()
+                returncode = 1
+    finally:
+        sys.argv = saved_argv
+        sys.path[:] = saved_path  # restored wholesale: the script may have edited sys.path too
+        os.chdir(saved_cwd)
+        # Forget modules the script imported so edited siblings are re-imported on the next attempt
+        for name in set(sys.modules) - preloaded_modules:
+            del sys.modules[name]
+    return returncode, stdout.getvalue(), stderr.getvalue()
+
+# Log view limits: oldest lines are dropped past LOG_MAX_BLOCKS; appends are coalesced per interval.
+LOG_MAX_BLOCKS = 5000
+LOG_FLUSH_INTERVAL_MS = 50
+
+# The progress bar samples the completed-task count at this interval instead of repainting per file.
+PROGRESS_POLL_INTERVAL_MS = 50
+
+# Fixed parts of the self-heal prompt; the code and error are joined in between
+SELF_HEAL_PROMPT_HEAD = (
+    "This file failed to run. Here's the code and the error. "
+    "Please fix it and show me the complete updated version.\n\n"
+    "--- CODE ---\n"
+)
+SELF_HEAL_PROMPT_MID = "\n\n--- ERROR ---\n"
+
 class SelfHealController:
     """
     Controller class encapsulating the self-healing logic.
     Contains methods for running and validating a file, reading/saving files,
     and executing auto-retry logic.
     """
-    def __init__(self, client: OpenAIClient, helpers: GuiHelpers, max_retries=5):
+    def __init__(self, client: OpenAIClient, helpers: GuiHelpers, max_retries=5, pooled_runs=False,
+                 max_concurrent_requests=2):
+        """
+        :param pooled_runs: If False (default), every attempt runs in a fresh interpreter subprocess,
+                            exactly like `python file.py`. If True, attempts are exec'd in a pool of
+                            long-lived worker processes, which skips interpreter startup on every
+                            retry but only approximates a real run (see _run_file); a script that
+                            is already running cannot be cancelled.
+        :param max_concurrent_requests: Maximum number of ChatGPT requests in flight across workers.
+        """
         self.client = client
         self.helpers = helpers
         self.max_retries = max_retries
+        self.pooled_runs = pooled_runs
+        self._api_sem = QtCore.QSemaphore(max_concurrent_requests)
+        self._exec_pool = self._create_exec_pool() if pooled_runs else None
+
+    @staticmethod
+    def _create_exec_pool():
+        return ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
 
-    def run_and_validate(self, file_path, cancelled_flag_callback):
+    def execute_file(self, file_path, cancel_event: threading.Event):
+        """
+        Run the file once.
+        :return: (returncode, stderr), or None if cancelled while a pooled run was queued or running.
+        """
+        if self._exec_pool is None:
+            returncode, _, stderr = run_process([sys.executable, "-X", "utf8", file_path])
+            return returncode, stderr
+
+        future = self._exec_pool.submit(_run_file, file_path)
+        while True:
+            try:
+                returncode, _, stderr = future.result(timeout=0.5)
+                return returncode, stderr
+            except concurrent.futures.TimeoutError:
+                if cancel_event.is_set():
+                    future.cancel()
+                    return None
+            except BrokenProcessPool as e:
+                self.helpers.logger.error(f"❌ Worker process died while running {file_path}: {e}")
+                self._exec_pool = self._create_exec_pool()
+                return 1, f"Worker process terminated while running {file_path}: {e}"
+
+    def shutdown(self):
+        """Release the worker process pool."""
+        if self._exec_pool is not None:
+            self._exec_pool.shutdown(wait=False, cancel_futures=True)
+            self._exec_pool = None
+
+    def run_and_validate(self, file_path, cancel_event: threading.Event):
         """
         Synchronously runs and validates a file self-heal.
         :param file_path: Path to the file to process.
-        :param cancelled_flag_callback: Function that returns True if cancellation is requested.
+        :param cancel_event: Event that is set when cancellation is requested.
         :return: Boolean indicating success.
         """
+        # Only our own save_file changes the file between attempts, so it is read once up front
+        file_content = None
         retries = 0
-        while retries < self.max_retries and not cancelled_flag_callback():
+        while retries < self.max_retries and not cancel_event.is_set():
             self.helpers.logger.info(f"▶️ Attempt {retries + 1} running {file_path}...")
-            result = subprocess.run(["python", file_path], capture_output=True, text=True)
-            if result.returncode == 0:
+            outcome = self.execute_file(file_path, cancel_event)
+            if outcome is None:
+                break
+            returncode, error_msg = outcome
+            if returncode == 0:
                 self.helpers.logger.info(f"✅ {file_path} ran successfully!")
                 return True
             else:
-                error_msg = result.stderr
                 self.helpers.logger.warning(f"❌ Execution failed for {file_path}: {error_msg}")
-                file_content = self.read_file(file_path)
-                if not file_content:
-                    self.helpers.logger.error(f"🚫 Unable to read {file_path}")
-                    return False
+                if file_content is None:
+                    file_content = self.read_file(file_path)
+                    if not file_content:
+                        self.helpers.logger.error(f"🚫 Unable to read {file_path}")
+                        return False
 
-                prompt = (
-                    "This file failed to run. Here's the code and the error. "
-                    "Please fix it and show me the complete updated version.\n\n"
-                    "--- CODE ---\n"
-                    f"{file_content}\n\n"
-                    "--- ERROR ---\n"
-                    f"{error_msg}"
-                )
+                prompt = "".join((SELF_HEAL_PROMPT_HEAD, file_content, SELF_HEAL_PROMPT_MID, error_msg))
                 self.helpers.logger.info("📤 Sending prompt to ChatGPT...")
-                response = self.client.get_chatgpt_response(prompt)
+                self._api_sem.acquire()
+                try:
+                    response = self.client.get_chatgpt_response(prompt)
+                finally:
+                    self._api_sem.release()
                 if response:
                     self.helpers.logger.info("📥 Received response, saving updated code...")
                     saved = self.save_file(file_path, response)
                     if not saved:
                         self.helpers.logger.error("🚫 Failed to save the updated code.")
                         return False
+                    file_content = response
                 else:
                     self.helpers.logger.error("🚫 No valid response from ChatGPT.")
                     return False
 
                 retries += 1
-                time.sleep(1)
+                # Exponential backoff (0.1s, 0.2s, 0.4s, ... capped at 5s); wakes immediately on cancel
+                if retries < self.max_retries and cancel_event.wait(min(0.1 * 2 ** (retries - 1), 5.0)):
+                    break
 
-        if cancelled_flag_callback():
+        if cancel_event.is_set():
             self.helpers.logger.info(f"⏹️ {file_path} cancelled by user.")
             return False
 
@@ -69,17 +185,16 @@ class SelfHealController:
         return False
 
     def read_file(self, file_path):
+        # Whole-file bytes read plus one decode, instead of buffered text-mode reads
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                return f.read()
+            return Path(file_path).read_bytes().decode("utf-8")
         except Exception as e:
             self.helpers.logger.error(f"❌ Failed to read {file_path}: {e}")
             return None
 
     def save_file(self, file_path, content):
         try:
-            with open(file_path, "w", encoding="utf-8") as f:
-                f.write(content)
+            Path(file_path).write_bytes(content.encode("utf-8"))
             return True
         except Exception as e:
             self.helpers.logger.error(f"❌ Failed to save {file_path}: {e}")
@@ -89,7 +204,8 @@ class SelfHealRunner(QtWidgets.QWidget):
     log_signal = QtCore.pyqtSignal(str)      # For log messages
     progress_signal = QtCore.pyqtSignal(int)   # For updating progress bar
 
-    def __init__(self, helpers: GuiHelpers, client: OpenAIClient, max_retries=5):
+    def __init__(self, helpers: GuiHelpers, client: OpenAIClient, max_retries=5,
+                 max_workers=None, max_concurrent_requests=2):
         """
         Initialize SelfHealRunner widget.
 
@@ -97,6 +213,8 @@ class SelfHealRunner(QtWidgets.QWidget):
             helpers (GuiHelpers): Utility helper instance for status updates.
             client (OpenAIClient): An instance of OpenAIClient for ChatGPT interactions.
             max_retries (int): Maximum number of self-heal attempts per file.
+            max_workers (int): Maximum files processed concurrently (default: min(8, CPU count)).
+            max_concurrent_requests (int): Maximum ChatGPT requests in flight at once.
         """
         super().__init__()
         self.helpers = helpers
@@ -104,16 +222,25 @@ class SelfHealRunner(QtWidgets.QWidget):
         self.max_retries = max_retries
 
         # Instantiate the controller to handle business logic.
-        self.controller = SelfHealController(client, helpers, max_retries)
+        self.controller = SelfHealController(
+            client, helpers, max_retries, max_concurrent_requests=max_concurrent_requests
+        )
 
         self.threadpool = QtCore.QThreadPool()
-        self.cancelled = False   # Cancellation flag
+        self.threadpool.setMaxThreadCount(max_workers or min(8, os.cpu_count() or 1))
+        self.cancel_event = threading.Event()  # Set to cancel pending and running tasks
         self.total_tasks = 0     # Total files to process
-        self.completed_tasks = 0 # Count of files processed
+        self.completed_tasks = 0 # Count of files processed (written on the GUI thread only)
+        self.completed_counter = itertools.count(1)  # Hands each finishing worker its completion number
+        self._shown_progress = 0
+
+        self._progress_timer = QtCore.QTimer(self)
+        self._progress_timer.setInterval(PROGRESS_POLL_INTERVAL_MS)
+        self._progress_timer.timeout.connect(self._poll_progress)
 
         self.init_ui()
         self.log_signal.connect(self.log)
-        self.progress_signal.connect(self.update_progress_bar)
+        self.progress_signal.connect(self._record_progress)
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -123,6 +250,10 @@ class SelfHealRunner(QtWidgets.QWidget):
         self.file_list.setSelectionMode(QtWidgets.QAbstractItemView.MultiSelection)
         layout.addWidget(self.file_list)
 
+        # Persistent file dialog: keeps the last directory and its listing between uses
+        self._file_dialog = QtWidgets.QFileDialog(self, "Select Python Files", "", "Python Files (*.py)")
+        self._file_dialog.setFileMode(QtWidgets.QFileDialog.ExistingFiles)
+
         # Add Files Button
         add_files_btn = QtWidgets.QPushButton("Add Files")
         add_files_btn.clicked.connect(self.add_files)
@@ -149,15 +280,24 @@ class SelfHealRunner(QtWidgets.QWidget):
         # Log Output
         self.log_output = QtWidgets.QPlainTextEdit()
         self.log_output.setReadOnly(True)
+        self.log_output.setMaximumBlockCount(LOG_MAX_BLOCKS)
         layout.addWidget(self.log_output)
 
+        # Buffered log lines, flushed to log_output in one append per timer tick
+        self._pending_logs = collections.deque()
+        self._last_status = None
+        self._log_flush_timer = QtCore.QTimer(self)
+        self._log_flush_timer.setSingleShot(True)
+        self._log_flush_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self._log_flush_timer.timeout.connect(self._flush_log)
+
         # Removed setup_status_bar() call since SelfHealRunner is a QWidget, not a QMainWindow.
         self.helpers.update_status_bar(self, "Self-Heal Ready")
 
     def add_files(self):
-        file_paths, _ = QtWidgets.QFileDialog.getOpenFileNames(
-            self, "Select Python Files", "", "Python Files (*.py)"
-        )
+        if not self._file_dialog.exec_():
+            return
+        file_paths = self._file_dialog.selectedFiles()
         for path in file_paths:
             self.file_list.addItem(path)
         self.log_signal.emit(f"✅ Added files: {len(file_paths)}")
@@ -171,12 +311,15 @@ class SelfHealRunner(QtWidgets.QWidget):
             return
 
         # Reset cancellation flag and progress counters
-        self.cancelled = False
+        self.cancel_event.clear()
         self.completed_tasks = 0
+        self.completed_counter = itertools.count(1)
         self.total_tasks = len(selected_items)
         self.progress_bar.setMaximum(self.total_tasks)
         self.progress_bar.setValue(0)
         self.progress_bar.setFormat("0 / {} files processed".format(self.total_tasks))
+        self._shown_progress = 0
+        self._progress_timer.start()
         self.cancel_btn.setEnabled(True)
         self.start_btn.setEnabled(False)
 
@@ -187,15 +330,44 @@ class SelfHealRunner(QtWidgets.QWidget):
             self.threadpool.start(worker)
 
     def cancel_self_heal(self):
-        self.cancelled = True
+        self.cancel_event.set()
         self.log_signal.emit("⏹️ Cancellation requested. Aborting remaining tasks...")
         self.cancel_btn.setEnabled(False)
 
     def log(self, message):
-        self.log_output.appendPlainText(message)
-        self.helpers.update_status_bar(self, message)
+        self._pending_logs.append(message)
+        if not self._log_flush_timer.isActive():
+            self._log_flush_timer.start()
         self.helpers.logger.info(message)
 
+    def _flush_log(self):
+        if not self._pending_logs:
+            return
+        last_message = self._pending_logs[-1]
+        self.log_output.appendPlainText("\n".join(self._pending_logs))
+        self._pending_logs.clear()
+        # Only the newest line of a burst is shown, and only if it changed
+        if last_message != self._last_status:
+            self._last_status = last_message
+            self.helpers.update_status_bar(self, last_message)
+
+    def closeEvent(self, event):
+        self.controller.shutdown()
+        super().closeEvent(event)
+
+    def _record_progress(self, done):
+        # Completion numbers can arrive out of order; keep the highest
+        if done > self.completed_tasks:
+            self.completed_tasks = done
+
+    def _poll_progress(self):
+        value = self.completed_tasks
+        if value != self._shown_progress:
+            self._shown_progress = value
+            self.update_progress_bar(value)
+        if value >= self.total_tasks:
+            self._progress_timer.stop()
+
     def update_progress_bar(self, value):
         # 'value' here is an integer representing the new progress value.
         self.progress_bar.setValue(value)
@@ -218,13 +390,13 @@ class SelfHealWorker(QtCore.QRunnable):
 
     def run(self):
         # Check cancellation before starting.
-        if self.runner_widget.cancelled:
+        if self.runner_widget.cancel_event.is_set():
             self.runner_widget.log_signal.emit(f"⏹️ Skipping {self.file_path} due to cancellation.")
             self._update_progress()
             return
 
         self.runner_widget.log_signal.emit(f"⚙️ Processing: {self.file_path}")
-        success = self.controller.run_and_validate(self.file_path, lambda: self.runner_widget.cancelled)
+        success = self.controller.run_and_validate(self.file_path, self.runner_widget.cancel_event)
         if success:
             self.runner_widget.log_signal.emit(f"✅ Self-Heal succeeded for {self.file_path}")
         else:
@@ -232,10 +404,10 @@ class SelfHealWorker(QtCore.QRunnable):
         self._update_progress()
 
     def _update_progress(self):
-        # Update the global progress.
-        self.runner_widget.completed_tasks += 1
-        # Emit the new progress value via the progress signal.
-        self.runner_widget.progress_signal.emit(self.runner_widget.completed_tasks)
+        # next() on itertools.count is atomic, so concurrent workers never share a number.
+        # The runner records it; its progress timer repaints on the next tick.
+        done = next(self.runner_widget.completed_counter)
+        self.runner_widget.progress_signal.emit(done)
 
 # ---------------------------
 # ENTRY POINT
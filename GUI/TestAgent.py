@@ -1,14 +1,52 @@
 import os
+import re
+import sys
+import asyncio
 import subprocess
 import time
+import functools
+import hashlib
+import threading
 from pathlib import Path
 import logging
 import json
 
+from GUI.ProcessRunner import run_process
 from chatgpt_automation.OpenAIClient import get_chatgpt_response  # Ensure this is defined in your chatgpt_driver module
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT_MARKERS = frozenset({".git", "setup.py", "pyproject.toml"})
+
+# Generated tests that passed are cached here, keyed by source content and model
+TEST_CACHE_DIR = Path.home() / ".cache" / "gpt_automation" / "tests"
+
+TEST_RUN_TIMEOUT = 300  # seconds
+
+# A test class or a test method, found in one scan
+_TEST_DECL_RE = re.compile(r"class Test|def test_")
+
+# Run unittest with this interpreter (no PATH lookup) in UTF-8 mode. Not -I/-S: generated
+# tests import the project from the working directory and may need site-packages.
+UNITTEST_CMD = (sys.executable, "-X", "utf8", "-m", "unittest")
+
+@functools.lru_cache(maxsize=256)
+def _find_root(path: Path):
+    """
+    Return the nearest directory at or above path containing a project marker, or None.
+    Cached per directory, so files in the same tree reuse earlier lookups instead of re-probing.
+    """
+    if path == path.parent:
+        return None
+    # One directory listing per level instead of an exists() probe per marker
+    try:
+        with os.scandir(path) as entries:
+            if any(entry.name in PROJECT_ROOT_MARKERS for entry in entries):
+                return path
+    except OSError:
+        pass
+    return _find_root(path.parent)
+
 def validate_test_code(code):
     """
     Basic validation: ensure the code is non-empty and contains a test class or test method.
@@ -17,9 +55,7 @@ def validate_test_code(code):
         return False
     if "unittest" not in code:
         return False
-    if "class Test" not in code and "def test_" not in code:
-        return False
-    return True
+    return _TEST_DECL_RE.search(code) is not None
 
 class TestAgent:
     def __init__(self, driver, helpers, timeout=120, tracker=None):
@@ -33,6 +69,10 @@ class TestAgent:
         self.helpers = helpers
         self.timeout = timeout
         self.tracker = tracker
+        self._tests_dirs = set()  # tests directories already known to exist
+        self._cache_dir = TEST_CACHE_DIR
+        # One agent may serve several worker threads; the browser driver handles one prompt at a time
+        self._driver_lock = threading.Lock()
 
     def run_full_test_cycle(self, file_path):
         """
@@ -56,11 +96,15 @@ class TestAgent:
             prev_test_code = new_test_code
             attempts += 1
 
+        # Cache the (possibly repaired) tests only once they pass
+        self._update_test_cache(file_path, None, prev_test_code if success else None)
+
         # If still failing and tracker is provided, try with best model from performance tracker.
         if not success and self.tracker is not None:
             best_model = self.tracker.choose_model(epsilon=0.0)
             logger.info(f"🔧 Fallback: Using best-performing model from tracker: {best_model}")
-            success, output, _ = self.generate_and_run(file_path, override_model=best_model)
+            success, output, fallback_test_code = self.generate_and_run(file_path, override_model=best_model)
+            self._update_test_cache(file_path, best_model, fallback_test_code if success else None)
 
         logger.info(f"✅ Test cycle complete for {file_path}. Success: {success}")
         return success, output
@@ -70,11 +114,11 @@ class TestAgent:
         Generate tests for a file (optionally with an override model), validate them, and run the tests.
         Returns a tuple: (success, output, generated_test_code).
         """
-        test_file = self.create_tests_for_file(file_path, override_model=override_model)
-        if not test_file:
+        created = self.create_tests_for_file(file_path, override_model=override_model)
+        if not created:
             return False, "❌ Test file creation failed.", None
 
-        test_code = self.helpers.read_file(test_file)
+        test_file, test_code = created
         if not self.validate_test_file(test_code):
             return False, "❌ Generated test file is invalid.", test_code
 
@@ -85,12 +129,26 @@ class TestAgent:
         """
         Reads the target file, constructs a prompt to generate tests (optionally forcing a model style),
         and saves the response as a test file.
+        Returns (test_file_path, test_code), or None on failure.
         """
         file_content = self.helpers.read_file(file_path)
         if file_content is None:
             logger.error("❌ Could not read file content.")
             return None
 
+        # Unchanged source + same model: reuse tests that passed before instead of asking again
+        test_file_path = self.get_test_file_path(file_path)
+        cache_path = self._get_cache_path(file_content, override_model)
+        if cache_path.is_file():
+            try:
+                cached_code = cache_path.read_bytes().decode("utf-8")
+            except (OSError, UnicodeDecodeError) as e:
+                logger.warning(f"⚠️ Failed to reuse cached tests {cache_path}: {e}")
+            else:
+                if self.helpers.save_file_fast(test_file_path, cached_code):
+                    logger.info(f"♻️ Reused cached tests for {file_path}: {test_file_path}")
+                    return test_file_path, cached_code
+
         if override_model:
             prompt = (
                 f"Using the {override_model} style, write a complete set of unit tests for the following Python code using the unittest framework. "
@@ -107,7 +165,7 @@ class TestAgent:
             )
 
         logger.info(f"📤 Sending prompt to generate tests for {file_path}...")
-        test_code = get_chatgpt_response(self.driver, prompt, timeout=self.timeout)
+        test_code = self._ask(prompt)
         if not test_code:
             logger.error("❌ No test code received.")
             return None
@@ -116,13 +174,47 @@ class TestAgent:
             logger.warning("⚠️ Generated test code failed validation.")
             return None
 
-        test_file_path = self.get_test_file_path(file_path)
-        if self.helpers.save_file(test_file_path, test_code):
+        if self.helpers.save_file_fast(test_file_path, test_code):
             logger.info(f"✅ Test file saved: {test_file_path}")
-            return test_file_path
+            return test_file_path, test_code
         else:
             return None
 
+    def _get_cache_path(self, file_content, override_model=None):
+        digest = hashlib.sha256()
+        digest.update((override_model or "default").encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(file_content.encode("utf-8"))
+        return self._cache_dir / f"{digest.hexdigest()}.py"
+
+    def _update_test_cache(self, file_path, override_model, passing_test_code):
+        """
+        Caches tests that passed against the current source and model; None drops the entry,
+        so tests that no longer pass (or never did) are not served again.
+        """
+        file_content = self.helpers.read_file(file_path)
+        if file_content is None:
+            return
+        cache_path = self._get_cache_path(file_content, override_model)
+        if passing_test_code is not None:
+            self._store_cached_tests(cache_path, passing_test_code)
+            return
+        try:
+            cache_path.unlink(missing_ok=True)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not drop cached tests {cache_path}: {e}")
+
+    def _store_cached_tests(self, cache_path, test_code):
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            cache_path.write_bytes(test_code.encode("utf-8"))
+        except OSError as e:
+            logger.warning(f"⚠️ Could not cache generated tests at {cache_path}: {e}")
+
+    def _ask(self, prompt):
+        with self._driver_lock:
+            return get_chatgpt_response(self.driver, prompt, timeout=self.timeout)
+
     def validate_test_file(self, test_code):
         is_valid = validate_test_code(test_code)
         if not is_valid:
@@ -136,9 +228,8 @@ class TestAgent:
         """
         logger.info(f"🧪 Running tests: {test_file}")
         try:
-            result = subprocess.run(
-                ["python", "-m", "unittest", test_file],
-                capture_output=True, text=True, timeout=300
+            returncode, stdout, stderr = run_process(
+                [*UNITTEST_CMD, test_file], timeout=TEST_RUN_TIMEOUT
             )
         except subprocess.TimeoutExpired as e:
             logger.error(f"❌ Timeout when running tests: {e}")
@@ -147,8 +238,8 @@ class TestAgent:
             logger.error(f"❌ Exception when running tests: {e}")
             return False, str(e)
 
-        output = result.stdout + "\n" + result.stderr
-        success = (result.returncode == 0)
+        output = stdout + "\n" + stderr
+        success = (returncode == 0)
         if success:
             logger.info(f"✅ Tests PASSED for {test_file}.\n{output}")
         else:
@@ -176,18 +267,29 @@ class TestAgent:
         )
 
         logger.info("📤 Sending prompt to repair test code...")
-        fixed_test_code = get_chatgpt_response(self.driver, prompt, timeout=self.timeout)
+        fixed_test_code = self._ask(prompt)
         if not fixed_test_code:
             logger.error("❌ Repair failed: no response from ChatGPT.")
             return False, "❌ Repair failed: no response from ChatGPT.", test_code
 
-        if not self.helpers.save_file(current_test_file, fixed_test_code):
+        if not self.helpers.save_file_fast(current_test_file, fixed_test_code):
             logger.error("❌ Repair failed: could not save fixed test code.")
             return False, "❌ Repair failed: could not save fixed test code.", test_code
 
         success, output = self.run_tests(current_test_file)
         return success, output, fixed_test_code
 
+    # ---------------------------
+    # Async pipeline
+    # ---------------------------
+    async def run_full_test_cycle_async(self, file_path):
+        """
+        Coroutine version of run_full_test_cycle: the same cycle runs on a worker thread,
+        so several files can be in different stages of the cycle at once (ChatGPT prompts
+        are still serialized by the driver lock). Returns (success, output).
+        """
+        return await asyncio.to_thread(self.run_full_test_cycle, file_path)
+
     def get_test_file_path(self, file_path):
         """
         Determines the tests folder relative to the project root.
@@ -195,9 +297,11 @@ class TestAgent:
         """
         project_root = self.find_project_root(file_path)
         tests_dir = Path(project_root) / "tests"
-        if not tests_dir.exists():
-            logger.info(f"🔨 Creating tests directory at {tests_dir}")
-            tests_dir.mkdir(parents=True, exist_ok=True)
+        if tests_dir not in self._tests_dirs:
+            if not tests_dir.exists():
+                logger.info(f"🔨 Creating tests directory at {tests_dir}")
+                tests_dir.mkdir(parents=True, exist_ok=True)
+            self._tests_dirs.add(tests_dir)
         base_name = os.path.basename(file_path)
         name_without_ext, _ = os.path.splitext(base_name)
         test_file = tests_dir / f"test_{name_without_ext}.py"
@@ -210,13 +314,33 @@ class TestAgent:
         Assumes a directory containing .git, setup.py, or pyproject.toml is the root.
         """
         path = Path(file_path).resolve().parent
-        while path != path.parent:
-            if any((path / marker).exists() for marker in [".git", "setup.py", "pyproject.toml"]):
-                logger.info(f"🏠 Project root found: {path}")
-                return path
-            path = path.parent
-        logger.warning(f"⚠️ No project root found. Defaulting to {path}")
-        return path
+        root = _find_root(path)
+        if root is not None:
+            logger.info(f"🏠 Project root found: {root}")
+            return root
+        anchor = Path(path.anchor)
+        logger.warning(f"⚠️ No project root found. Defaulting to {anchor}")
+        return anchor
+
+async def run_test_cycles_async(test_agent, file_paths, max_concurrency=8, on_result=None):
+    """
+    Run test_agent.run_full_test_cycle_async for every file, at most max_concurrency at a time.
+    on_result(file_path, result) is called as each file finishes; result is (success, output)
+    or the raised exception. Returns the results in file_paths order.
+    """
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def tester(file_path):
+        async with semaphore:
+            try:
+                result = await test_agent.run_full_test_cycle_async(file_path)
+            except Exception as e:
+                result = e
+        if on_result:
+            on_result(file_path, result)
+        return result
+
+    return await asyncio.gather(*(tester(file_path) for file_path in file_paths))
 
 # ---------------------------
 # Example usage:
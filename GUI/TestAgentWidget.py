@@ -1,7 +1,13 @@
 import os
+import stat
+import asyncio
+import threading
 from PyQt5 import QtWidgets, QtCore
 from PyQt5.QtWidgets import QHBoxLayout, QListWidgetItem
 
+# Maximum number of files whose test cycles run concurrently
+MAX_TEST_WORKERS = 8
+
 class TestAgentWidget(QtWidgets.QWidget):
     """
     Widget to select one or more Python files (or folders), generate tests using ChatGPT (or LLM),
@@ -9,11 +15,18 @@ class TestAgentWidget(QtWidgets.QWidget):
 
     NOW WITH MULTI-FILE & FOLDER DRAG-AND-DROP SUPPORT!
     """
+    log_signal = QtCore.pyqtSignal(str)   # Thread-safe logging from test workers
+    tests_finished = QtCore.pyqtSignal()  # Emitted once every test cycle has completed
+
     def __init__(self, helpers, engine):
         super().__init__()
         self.helpers = helpers
         self.engine = engine
+        self._paths = set()  # Paths already in file_list, kept in sync by add_files
+        self._test_agent = None  # Shared across runs so its caches persist; see get_test_agent
         self.init_ui()
+        self.log_signal.connect(self.log)
+        self.tests_finished.connect(self.on_tests_finished)
 
     def init_ui(self):
         layout = QtWidgets.QVBoxLayout(self)
@@ -25,6 +38,10 @@ class TestAgentWidget(QtWidgets.QWidget):
         self.file_list.setSelectionMode(QtWidgets.QAbstractItemView.ExtendedSelection)
         self.file_list.files_dropped.connect(self.on_files_dropped)
 
+        # Persistent file dialog: keeps the last directory and its listing between uses
+        self._file_dialog = QtWidgets.QFileDialog(self, "Select Python Files", "", "Python Files (*.py)")
+        self._file_dialog.setFileMode(QtWidgets.QFileDialog.ExistingFiles)
+
         browse_btn = QtWidgets.QPushButton("Browse...")
         browse_btn.clicked.connect(self.browse_files)
 
@@ -43,9 +60,9 @@ class TestAgentWidget(QtWidgets.QWidget):
         layout.addWidget(self.log_output)
 
     def browse_files(self):
-        files, _ = QtWidgets.QFileDialog.getOpenFileNames(
-            self, "Select Python Files", "", "Python Files (*.py)"
-        )
+        if not self._file_dialog.exec_():
+            return
+        files = self._file_dialog.selectedFiles()
         if files:
             self.add_files(files)
 
@@ -56,20 +73,26 @@ class TestAgentWidget(QtWidgets.QWidget):
 
     def add_files(self, files):
         """Add files to the list, avoiding duplicates."""
-        existing_files = {self.file_list.item(i).text() for i in range(self.file_list.count())}
+        for file_path in self._expand_paths(files):
+            if file_path in self._paths:
+                continue
+            self._paths.add(file_path)
+            self.file_list.addItem(QListWidgetItem(file_path))
+
+    def _expand_paths(self, files):
         for file_path in files:
-            if file_path not in existing_files and file_path.endswith('.py'):
-                item = QListWidgetItem(file_path)
-                self.file_list.addItem(item)
+            if file_path.endswith('.py'):
+                yield file_path
             elif os.path.isdir(file_path):
                 # Recursively add all Python files from folders
-                for root, _, filenames in os.walk(file_path):
-                    for filename in filenames:
-                        if filename.endswith('.py'):
-                            full_path = os.path.join(root, filename)
-                            if full_path not in existing_files:
-                                item = QListWidgetItem(full_path)
-                                self.file_list.addItem(item)
+                yield from self._walk_py(file_path)
+
+    @staticmethod
+    def _walk_py(root):
+        for dirpath, _, filenames in os.walk(root):
+            for filename in filenames:
+                if filename.endswith('.py'):
+                    yield os.path.join(dirpath, filename)
 
     def run_tests(self):
         count = self.file_list.count()
@@ -78,30 +101,52 @@ class TestAgentWidget(QtWidgets.QWidget):
             self.helpers.show_warning("Please select at least one file.", "No Files Selected")
             return
 
-        file_paths = [self.file_list.item(i).text() for i in range(count)]
-
-        self.run_tests_btn.setEnabled(False)
-        self.log(f"🚀 Starting test generation and execution for {count} files...")
-
-        for file_path in file_paths:
-            if not os.path.exists(file_path):
+        file_paths = []
+        for i in range(count):
+            file_path = self.file_list.item(i).text()
+            if os.path.exists(file_path):
+                file_paths.append(file_path)
+            else:
                 self.log(f"❌ File not found: {file_path}")
-                continue
-
-            try:
-                from GUI.TestAgent import TestAgent
-                test_agent = TestAgent(driver=self.engine.driver, helpers=self.helpers)
-
-                self.helpers.update_status_bar(self.window(), f"Running tests for {file_path}...")
-
-                success, output = test_agent.run_full_test_cycle(file_path)
-
-                status = "✅ Success!" if success else "❌ Failure!"
-                self.log(f"{status}: {file_path}\n{output}\n\n")
+        if not file_paths:
+            return
 
-            except Exception as e:
-                self.log(f"❌ Error during test cycle for {file_path}:\n{e}")
+        self.run_tests_btn.setEnabled(False)
+        self.log(f"🚀 Starting test generation and execution for {len(file_paths)} files...")
+        self.helpers.update_status_bar(self.window(), f"Running tests for {len(file_paths)} files...")
+
+        # Test cycles run off the GUI thread; results come back through log_signal
+        threading.Thread(target=self._run_test_cycles, args=(file_paths,), daemon=True).start()
+
+    def _run_test_cycles(self, file_paths):
+        """Run the test cycle for every file concurrently and log each result as it completes."""
+        try:
+            from GUI.TestAgent import run_test_cycles_async
+            asyncio.run(run_test_cycles_async(
+                self.get_test_agent(), file_paths, max_concurrency=MAX_TEST_WORKERS, on_result=self._emit_test_result
+            ))
+        except Exception as e:
+            self.log_signal.emit(f"❌ Error starting test cycles: {e}")
+        finally:
+            self.tests_finished.emit()
+
+    def get_test_agent(self):
+        """Return the widget's TestAgent, recreating it only if the engine's driver has changed."""
+        from GUI.TestAgent import TestAgent
+        driver = self.engine.driver
+        if self._test_agent is None or self._test_agent.driver is not driver:
+            self._test_agent = TestAgent(driver=driver, helpers=self.helpers)
+        return self._test_agent
+
+    def _emit_test_result(self, file_path, result):
+        if isinstance(result, Exception):
+            self.log_signal.emit(f"❌ Error during test cycle for {file_path}:\n{result}")
+            return
+        success, output = result
+        status = "✅ Success!" if success else "❌ Failure!"
+        self.log_signal.emit(f"{status}: {file_path}\n{output}\n\n")
 
+    def on_tests_finished(self):
         self.run_tests_btn.setEnabled(True)
         self.helpers.update_status_bar(self.window(), "Ready")
 
@@ -120,51 +165,77 @@ class FileDropListWidget(QtWidgets.QListWidget):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setAcceptDrops(True)
+        # Paths extracted from the mime data of the drag in progress, keyed by the mime object id
+        self._last_mime_id = None
+        self._last_paths = []
 
     def dragEnterEvent(self, event):
-        mime = event.mimeData()
-        if self._has_valid_files(mime):
+        if self._has_valid_files(event.mimeData()):
             event.acceptProposedAction()
         else:
             event.ignore()
 
+    def dragMoveEvent(self, event):
+        # Fired continuously while hovering; answered from the cached paths of this drag
+        if self._has_valid_files(event.mimeData()):
+            event.acceptProposedAction()
+        else:
+            event.ignore()
+
+    def dragLeaveEvent(self, event):
+        self._reset_drag_cache()
+        super().dragLeaveEvent(event)
+
     def dropEvent(self, event):
-        mime = event.mimeData()
+        files = self._dropped_paths(event.mimeData())
+        self._reset_drag_cache()
+
+        if files:
+            self.files_dropped.emit(files)
+
+        event.acceptProposedAction()
+
+    def _has_valid_files(self, mime):
+        return bool(self._dropped_paths(mime))
+
+    def _dropped_paths(self, mime):
+        """Return the .py files and folders carried by mime, computed once per drag."""
+        mime_id = id(mime)
+        if mime_id != self._last_mime_id:
+            self._last_paths = self._collect_paths(mime)
+            self._last_mime_id = mime_id
+        return self._last_paths
+
+    def _reset_drag_cache(self):
+        self._last_mime_id = None
+        self._last_paths = []
+
+    @staticmethod
+    def _collect_paths(mime):
         files = []
 
         # Handle external files (URLs)
         if mime.hasUrls():
-            files.extend([
+            files.extend(
                 url.toLocalFile()
                 for url in mime.urls()
-                if url.isLocalFile() and (url.toLocalFile().endswith('.py') or os.path.isdir(url.toLocalFile()))
-            ])
+                if url.isLocalFile() and _is_droppable(url.toLocalFile())
+            )
 
         # Handle internal drags (MIME text)
         if mime.hasText():
             # Split multiple file paths by newline or semicolon if needed
-            text_paths = mime.text().splitlines()
-            files.extend([
-                path for path in text_paths
-                if (path.endswith('.py') and os.path.exists(path)) or os.path.isdir(path)
-            ])
+            files.extend(path for path in mime.text().splitlines() if _is_droppable(path))
 
-        if files:
-            self.files_dropped.emit(files)
+        return files
 
-        event.acceptProposedAction()
 
-    def _has_valid_files(self, mime):
-        # Check for URLs
-        if mime.hasUrls():
-            for url in mime.urls():
-                local_path = url.toLocalFile()
-                if (local_path.endswith('.py') and os.path.isfile(local_path)) or os.path.isdir(local_path):
-                    return True
-        # Check for text (internal drags)
-        if mime.hasText():
-            paths = mime.text().splitlines()
-            for path in paths:
-                if (path.endswith('.py') and os.path.exists(path)) or os.path.isdir(path):
-                    return True
+def _is_droppable(path):
+    """True for an existing .py file or a folder, using a single stat call."""
+    try:
+        st = os.stat(path)
+    except (OSError, ValueError):
         return False
+    if stat.S_ISDIR(st.st_mode):
+        return True
+    return path.endswith('.py') and stat.S_ISREG(st.st_mode)
@@ -5,16 +5,31 @@ from setup_logging import setup_logging
 
 logger = setup_logging("worker_thread", log_dir=os.path.join(os.getcwd(), "logs", "social"))
 
-class Worker(QtCore.QThread):
+class WorkerSignals(QtCore.QObject):
+    """Signals emitted by Worker (QRunnable cannot define signals itself)."""
     # Emitting: file_path, status message, updated_content, row index
     result_signal = QtCore.pyqtSignal(str, str, str, int)
 
+class Worker(QtCore.QRunnable):
+    """
+    Processes one file on a QThreadPool thread instead of owning a dedicated QThread.
+    Connect to worker.result_signal, then call start() (or submit it to any QThreadPool).
+    """
     def __init__(self, file_path, engine, manual_model=None, row_index=None):
         super().__init__()
         self.file_path = file_path
         self.engine = engine
         self.manual_model = manual_model
         self.row_index = row_index
+        self.signals = WorkerSignals()
+
+    @property
+    def result_signal(self):
+        return self.signals.result_signal
+
+    def start(self):
+        """Queue this worker on the global thread pool (sized to QThread.idealThreadCount())."""
+        QtCore.QThreadPool.globalInstance().start(self)
 
     def run(self):
         logger.info(f"🚀 Processing: {self.file_path}")
@@ -1,10 +1,13 @@
 import os
+import functools
 import importlib.util
 from pathlib import Path
 import logging
 
 logger = logging.getLogger(__name__)
 
+PROJECT_ROOT_MARKERS = frozenset({'.git', 'setup.py', 'pyproject.toml'})
+
 class ModelRegistry:
     def __init__(self, models_dir=None):
         """
@@ -14,15 +17,19 @@ class ModelRegistry:
 
         self.models_dir = Path(models_dir) if models_dir else self.project_root / 'models'
         self.registry = {}
+        self._loaded = {}  # module path -> (st_mtime_ns, registry name, registry entry)
 
         logger.info(f"📂 Looking for models in: {self.models_dir}")
 
         # Load models on startup
         self.load_models()
 
-    def find_project_root(self):
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def find_project_root():
         """
         Walk upward to find the project root.
+        The result only depends on this file's location, so it is computed once per process.
         """
         path = Path(__file__).resolve().parent
 
@@ -31,7 +38,13 @@ class ModelRegistry:
                 logger.info(f"🏠 Project root anchored at: {path}")
                 return path
 
-            if any((path / marker).exists() for marker in ['.git', 'setup.py', 'pyproject.toml']):
+            # One directory listing per level instead of an exists() probe per marker
+            try:
+                with os.scandir(path) as entries:
+                    found = any(entry.name in PROJECT_ROOT_MARKERS for entry in entries)
+            except OSError:
+                found = False
+            if found:
                 logger.info(f"🏠 Marker-based project root found at: {path}")
                 return path
 
@@ -44,7 +57,9 @@ class ModelRegistry:
         """
         Loads all models from the models directory.
         """
-        if not self.models_dir.exists():
+        try:
+            entries = os.scandir(self.models_dir)
+        except FileNotFoundError:
             logger.warning(f"📁 Models directory not found. Creating: {self.models_dir}")
             self.models_dir.mkdir(parents=True, exist_ok=True)
             return
@@ -53,9 +68,12 @@ class ModelRegistry:
 
         self.registry.clear()
 
-        for filename in os.listdir(self.models_dir):
-            if filename.endswith('.py') and filename.startswith('model_'):
-                self._load_single_model(filename)
+        # Everything per file comes from the DirEntry: name, path, type (d_type) and its cached stat()
+        with entries:
+            for entry in entries:
+                name = entry.name
+                if name.endswith('.py') and name.startswith('model_') and entry.is_file():
+                    self._load_single_model_entry(entry)
 
         logger.info(f"✅ {len(self.registry)} models loaded successfully.")
 
@@ -64,7 +82,29 @@ class ModelRegistry:
         Load an individual model file.
         """
         module_path = self.models_dir / filename
-        module_name = module_path.stem
+        try:
+            mtime_ns = module_path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        self._load_model_file(module_path.stem, str(module_path), mtime_ns)
+
+    def _load_single_model_entry(self, entry):
+        """
+        Load an individual model file from a scandir entry, reusing its name, path and stat.
+        """
+        try:
+            mtime_ns = entry.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        self._load_model_file(entry.name[:-3], entry.path, mtime_ns)
+
+    def _load_model_file(self, module_name, module_path, mtime_ns=None):
+        # Unchanged since it was last executed: re-register the cached entry without re-running the module
+        cached = self._loaded.get(module_path)
+        if cached is not None and mtime_ns is not None and cached[0] == mtime_ns:
+            self.registry[cached[1]] = cached[2]
+            logger.info(f"✅ Model registered (unchanged): {cached[1]}")
+            return
 
         try:
             spec = importlib.util.spec_from_file_location(module_name, module_path)
@@ -83,11 +123,14 @@ class ModelRegistry:
                 logger.error(f"❌ {module_name} returned incomplete data: {metadata}")
                 return
 
-            self.registry[metadata['name']] = {
+            entry = {
                 'threshold': metadata['threshold'],
                 'handler': metadata['handler'],
                 'endpoint': metadata['endpoint']
             }
+            self.registry[metadata['name']] = entry
+            if mtime_ns is not None:
+                self._loaded[module_path] = (mtime_ns, metadata['name'], entry)
 
             logger.info(
                 f"✅ Model registered: {metadata['name']} | "
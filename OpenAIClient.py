@@ -2,18 +2,79 @@ import os
 import time
 import json
 import pickle
+import asyncio
 import logging
 import shutil
-from selenium.webdriver.common.by import By
-import undetected_chromedriver as uc
-from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+import functools
+import contextlib
+from concurrent.futures import ThreadPoolExecutor
+
+# selenium / undetected_chromedriver are imported inside the methods that use them, so importing
+# this module (e.g. for the class or from tooling) does not pay their import cost up front.
 
 from setup_logging import setup_logging
 
 logger = setup_logging("openai_login", log_dir=os.path.join(os.getcwd(), "logs", "social"))
 
+# Element locators, built once. The strategy strings are the values of selenium's By.CSS_SELECTOR
+# and By.XPATH, spelled out so selenium is not imported with the module.
+PROMPT_INPUT = ("css selector", "div.ProseMirror[contenteditable='true']")
+RESPONSE_MESSAGES = ("css selector", ".markdown.prose.w-full.break-words")
+STOP_BUTTON = ("css selector", "button[data-testid='stop-button']")
+CONVERSATION_LINKS = ("css selector", "nav a[href^='/c/']")
+# Matched on the button's text, which CSS selectors cannot express
+CONTINUE_BUTTON = ("xpath", "//button[contains(text(), 'Continue generating')]")
+
+def _to_cdp_cookie(cookie):
+    """Convert a WebDriver cookie dict (as saved by get_cookies) to a CDP Network.CookieParam."""
+    cdp_cookie = {key: value for key, value in cookie.items() if key not in ("sameSite", "expiry")}
+    if "expiry" in cookie:
+        cdp_cookie["expires"] = cookie["expiry"]
+    if "domain" not in cdp_cookie:
+        cdp_cookie["url"] = "https://chat.openai.com/"
+    return cdp_cookie
+
+@functools.lru_cache(maxsize=4)
+def _resolve_driver_path(driver_path, cached_driver_path):
+    """
+    Locate a ChromeDriver binary: the custom driver_path, else the cached copy, else download one
+    with webdriver_manager and cache it. Memoized, so later clients skip the probes and the download.
+    """
+    if driver_path and os.path.exists(driver_path):
+        logger.info(f"🔎 Using custom ChromeDriver: {driver_path}")
+        return driver_path
+    if os.path.exists(cached_driver_path):
+        logger.info(f"🔎 Using cached ChromeDriver: {cached_driver_path}")
+        return cached_driver_path
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+    except ImportError:
+        logger.error("❌ webdriver_manager is not installed. Run 'pip install webdriver_manager'")
+        raise
+
+    logger.warning("❌ No valid ChromeDriver found locally. Downloading with webdriver_manager...")
+    try:
+        downloaded_driver_path = ChromeDriverManager().install()
+        logger.info(f"✅ ChromeDriver downloaded to {downloaded_driver_path}")
+
+        # Look for the actual executable in the directory
+        driver_dir = os.path.dirname(downloaded_driver_path)
+        if os.path.isdir(driver_dir):
+            with os.scandir(driver_dir) as entries:
+                exe_path = next((entry.path for entry in entries if entry.name.endswith(".exe")), None)
+            if exe_path:
+                downloaded_driver_path = exe_path
+                logger.info(f"✅ ChromeDriver executable found at {downloaded_driver_path}")
+
+        os.makedirs(os.path.dirname(cached_driver_path), exist_ok=True)
+        shutil.copyfile(downloaded_driver_path, cached_driver_path)
+        logger.info(f"✅ ChromeDriver cached at {cached_driver_path}")
+        return cached_driver_path
+    except Exception as e:
+        logger.error(f"❌ Failed to download ChromeDriver: {e}")
+        raise FileNotFoundError("ChromeDriver not found. Provide a valid driver_path or place a driver in /drivers/.")
+
 class OpenAIClient:
     def __init__(self, profile_dir, headless=False, driver_path=None):
         """
@@ -37,46 +98,20 @@ class OpenAIClient:
         # Initialize driver
         self.driver = self.get_openai_driver()
 
+        # Reused for every wait on the prompt input
+        from selenium.webdriver.support.ui import WebDriverWait
+        self._wait = WebDriverWait(self.driver, 15)
+
     def get_openai_driver(self):
         """
         Returns a stealth Chrome driver using undetected_chromedriver.
         """
-        try:
-            from webdriver_manager.chrome import ChromeDriverManager
-        except ImportError:
-            logger.error("❌ webdriver_manager is not installed. Run 'pip install webdriver_manager'")
-            raise
-
-        final_driver_path = None
-
-        if self.driver_path and os.path.exists(self.driver_path):
-            final_driver_path = self.driver_path
-            logger.info(f"🔎 Using custom ChromeDriver: {final_driver_path}")
-        elif os.path.exists(self.CACHED_DRIVER_PATH):
-            final_driver_path = self.CACHED_DRIVER_PATH
-            logger.info(f"🔎 Using cached ChromeDriver: {final_driver_path}")
-        else:
-            logger.warning("❌ No valid ChromeDriver found locally. Downloading with webdriver_manager...")
-            try:
-                downloaded_driver_path = ChromeDriverManager().install()
-                logger.info(f"✅ ChromeDriver downloaded to {downloaded_driver_path}")
-
-                # Look for the actual executable in the directory
-                driver_dir = os.path.dirname(downloaded_driver_path)
-                if os.path.isdir(driver_dir):
-                    for filename in os.listdir(driver_dir):
-                        if filename.endswith(".exe"):
-                            downloaded_driver_path = os.path.join(driver_dir, filename)
-                            logger.info(f"✅ ChromeDriver executable found at {downloaded_driver_path}")
-                            break
-
-                os.makedirs(os.path.dirname(self.CACHED_DRIVER_PATH), exist_ok=True)
-                shutil.copyfile(downloaded_driver_path, self.CACHED_DRIVER_PATH)
-                final_driver_path = self.CACHED_DRIVER_PATH
-                logger.info(f"✅ ChromeDriver cached at {final_driver_path}")
-            except Exception as e:
-                logger.error(f"❌ Failed to download ChromeDriver: {e}")
-                raise FileNotFoundError("ChromeDriver not found. Provide a valid driver_path or place a driver in /drivers/.")
+        import undetected_chromedriver as uc
+        final_driver_path = _resolve_driver_path(self.driver_path, self.CACHED_DRIVER_PATH)
+        if not os.path.exists(final_driver_path):
+            # The remembered binary was removed since it was resolved; resolve again
+            _resolve_driver_path.cache_clear()
+            final_driver_path = _resolve_driver_path(self.driver_path, self.CACHED_DRIVER_PATH)
 
         options = uc.ChromeOptions()
         options.add_argument("--start-maximized")
@@ -121,16 +156,24 @@ class OpenAIClient:
             logger.warning("⚠️ No OpenAI cookie file found. Manual login may be required.")
             return False
 
-        self.driver.get(self.CHATGPT_URL)
-        time.sleep(2)
-
         try:
             with open(self.COOKIE_FILE, "rb") as f:
                 cookies = pickle.load(f)
-            for cookie in cookies:
-                cookie.pop("sameSite", None)
-                self.driver.add_cookie(cookie)
-            self.driver.refresh()
+
+            try:
+                # One CDP call installs every cookie, without first loading the page to set the domain
+                self.driver.execute_cdp_cmd("Network.setCookies", {"cookies": [
+                    _to_cdp_cookie(cookie) for cookie in cookies
+                ]})
+                self.driver.get(self.CHATGPT_URL)
+            except Exception as e:
+                logger.warning(f"⚠️ CDP cookie load failed ({e}); adding cookies one by one.")
+                self.driver.get(self.CHATGPT_URL)
+                time.sleep(2)
+                for cookie in cookies:
+                    cookie.pop("sameSite", None)
+                    self.driver.add_cookie(cookie)
+                self.driver.refresh()
             time.sleep(5)
             logger.info("✅ OpenAI cookies loaded and session refreshed.")
             return True
@@ -185,30 +228,39 @@ class OpenAIClient:
             logger.error("❌ Manual OpenAI login failed. Try again.")
             return False
 
-    def send_prompt_smoothly(self, element, prompt, delay=0.05):
+    def send_prompt_smoothly(self, element, prompt, delay=0.05, chunk_size=64):
         """
-        Sends the prompt text one character at a time for a more human-like interaction.
+        Sends the prompt text in chunks of chunk_size characters for a human-like but fast interaction.
+        Each chunk is one WebDriver call, followed by a pause of delay seconds per character typed.
+        chunk_size=None sends the whole prompt in a single call without pausing.
         """
-        for char in prompt:
-            element.send_keys(char)
-            time.sleep(delay)
+        if not chunk_size:
+            element.send_keys(prompt)
+            return
+
+        for start in range(0, len(prompt), chunk_size):
+            chunk = prompt[start:start + chunk_size]
+            element.send_keys(chunk)
+            time.sleep(delay * len(chunk))
 
-    def get_chatgpt_response(self, prompt, timeout=120, model_url=None):
+    def get_chatgpt_response(self, prompt, timeout=120, model_url=None, navigate=True):
         """
         Sends a prompt to ChatGPT and retrieves the full response by interacting with the ProseMirror element.
+        With navigate=False the prompt goes to the conversation already open in the browser
+        instead of loading model_url / the ChatGPT home page first.
         """
+        from selenium.webdriver.common.keys import Keys
+        from selenium.webdriver.support import expected_conditions as EC
+
         logger.info("✉️ Sending prompt to ChatGPT...")
 
         try:
-            target_url = model_url if model_url else self.CHATGPT_URL
-            self.driver.get(target_url)
-
-            wait = WebDriverWait(self.driver, 15)
+            if navigate:
+                target_url = model_url if model_url else self.CHATGPT_URL
+                self.driver.get(target_url)
 
             # Wait for the ProseMirror contenteditable div to be present and clickable.
-            input_div = wait.until(EC.element_to_be_clickable(
-                (By.CSS_SELECTOR, "div.ProseMirror[contenteditable='true']")
-            ))
+            input_div = self._wait.until(EC.element_to_be_clickable(PROMPT_INPUT))
             logger.info("✅ Found ProseMirror input.")
 
             input_div.click()
@@ -216,49 +268,72 @@ class OpenAIClient:
             # Type the prompt slowly for human-like behavior.
             self.send_prompt_smoothly(input_div, prompt, delay=0.03)
 
-            # Submit the prompt
+            # Submit the prompt; the message count tells get_full_response when a reply has arrived
+            previous_messages = len(self.driver.find_elements(*RESPONSE_MESSAGES))
             input_div.send_keys(Keys.RETURN)
             logger.info("✅ Prompt submitted, waiting for response...")
 
-            return self.get_full_response(timeout=timeout)
+            return self.get_full_response(timeout=timeout, previous_messages=previous_messages)
 
         except Exception as e:
             logger.error(f"❌ Error in get_chatgpt_response: {e}")
             return ""
 
-    def get_full_response(self, timeout=120):
+    def get_full_response(self, timeout=120, previous_messages=None):
         """
         Waits for the full response from ChatGPT, clicking "Continue generating" if necessary.
+        Generation is tracked through the "Stop generating" button: the response is read once
+        that button has gone away, instead of polling the message text on a fixed interval.
+        previous_messages is the number of response messages before the prompt was sent (counted
+        on entry if omitted); a reply beyond that count means generation has started, or already
+        finished if it ended before the stop button was ever seen.
         """
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.common.exceptions import TimeoutException
+
         logger.info("🔄 Waiting for full response...")
-        start_time = time.time()
-        full_response = ""
+        deadline = time.monotonic() + timeout
+        if previous_messages is None:
+            previous_messages = len(self.driver.find_elements(*RESPONSE_MESSAGES))
+
+        def generating(driver):
+            return bool(driver.find_elements(*STOP_BUTTON))
+
+        def started(driver):
+            return generating(driver) or len(driver.find_elements(*RESPONSE_MESSAGES)) > previous_messages
 
         while True:
-            if time.time() - start_time > timeout:
+            try:
+                # Generation may take a moment to start; a reply without a stop button means it already ended
+                WebDriverWait(self.driver, max(min(10, deadline - time.monotonic()), 0), poll_frequency=0.2).until(started)
+            except TimeoutException:
+                pass
+
+            try:
+                WebDriverWait(self.driver, max(deadline - time.monotonic(), 0), poll_frequency=0.2).until_not(generating)
+            except TimeoutException:
                 logger.warning("⚠️ Timeout reached while waiting for ChatGPT response.")
                 break
 
-            time.sleep(3)
             try:
-                messages = self.driver.find_elements(By.CSS_SELECTOR, ".markdown.prose.w-full.break-words")
-                if messages:
-                    latest_message = messages[-1].text
-                    if latest_message != full_response:
-                        full_response = latest_message
-                    else:
-                        logger.info("✅ Response appears complete.")
-                        break
-
-                continue_buttons = self.driver.find_elements(By.XPATH, "//button[contains(text(), 'Continue generating')]")
-                if continue_buttons:
-                    logger.info("🔘 Clicking 'Continue generating'...")
-                    continue_buttons[0].click()
+                continue_buttons = self.driver.find_elements(*CONTINUE_BUTTON)
             except Exception as e:
                 logger.error(f"❌ Error during response fetch: {e}")
-                continue
+                break
+            if not continue_buttons or time.monotonic() >= deadline:
+                logger.info("✅ Response appears complete.")
+                break
+            logger.info("🔘 Clicking 'Continue generating'...")
+            # The continuation extends the current reply, so only the stop button signals it
+            previous_messages = len(self.driver.find_elements(*RESPONSE_MESSAGES))
+            continue_buttons[0].click()
 
-        return full_response
+        try:
+            messages = self.driver.find_elements(*RESPONSE_MESSAGES)
+            return messages[-1].text if messages else ""
+        except Exception as e:
+            logger.error(f"❌ Error during response fetch: {e}")
+            return ""
 
     def process_prompt(self, prompt, timeout=120, model_url=None):
         """
@@ -273,7 +348,8 @@ class OpenAIClient:
         response = self.get_chatgpt_response(prompt, timeout=timeout, model_url=model_url)
         return response
 
-    def iterate_conversations(self, question, delay_between=3, max_threads=None, save_dir="conversation_queries"):
+    def iterate_conversations(self, question, delay_between=3, max_threads=None, save_dir="conversation_queries",
+                              per_file=False):
         """
         Iterate over each ChatGPT conversation visible in the sidebar, ask a uniform
         question, capture the response, and save the result to disk.
@@ -282,54 +358,192 @@ class OpenAIClient:
             question (str): The prompt/question you want to ask in every thread.
             delay_between (int): Seconds to wait after switching threads before sending the question.
             max_threads (int|None): Process only the first *n* threads; None means no limit.
-            save_dir (str): Directory used to persist each answer as a text file.
+            save_dir (str): Directory used to persist the answers.
+            per_file (bool): Write each answer to <save_dir>/<conv_id>.txt instead of appending
+                             one {"id", "response"} line per answer to <save_dir>/responses.jsonl.
 
         Returns:
             dict[str, str]: Mapping of conversation identifier (slug or title) to the response text.
         """
+        return dict(self._iter_conversations(question, delay_between, max_threads, save_dir, per_file))
+
+    async def iterate_conversations_async(self, question, delay_between=3, max_threads=None,
+                                          save_dir="conversation_queries", per_file=False, concurrency=1):
+        """
+        Async variant of iterate_conversations that works on up to `concurrency` conversations at once
+        (default 1: only this client's browser is used).
+
+        A WebDriver can only drive one page at a time, so every extra slot gets its own browser: a
+        profile-less OpenAIClient logged in from the cookie jar (COOKIE_FILE) this client saves first.
+        Helpers that cannot log in with those cookies are dropped, so the run degrades to fewer slots
+        rather than failing. All Selenium calls run on a thread pool, one thread per browser at a time;
+        answers are persisted on the event loop as they complete, so the output file has a single writer.
+
+        Returns:
+            dict[str, str]: Mapping of conversation identifier to the response text, in completion order.
+        """
+        loop = asyncio.get_running_loop()
+        results = {}
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+            conv_hrefs = await loop.run_in_executor(pool, self._snapshot_conversations, max_threads)
+            if conv_hrefs is None:
+                return results
+            os.makedirs(save_dir, exist_ok=True)
+
+            clients = [self]
+            helper_count = min(concurrency, len(conv_hrefs)) - 1
+            if helper_count > 0:
+                await loop.run_in_executor(pool, self.save_openai_cookies)
+                helpers = await asyncio.gather(*(
+                    loop.run_in_executor(pool, self._open_helper_client) for _ in range(helper_count)
+                ))
+                clients.extend(helper for helper in helpers if helper is not None)
+                logger.info(f"🧵 Processing conversations with {len(clients)} browser(s).")
+
+            # Shared by every slot; coroutines only switch at await points, so no lock is needed
+            pending = iter(enumerate(conv_hrefs))
+
+            async def work(client):
+                for idx, conv_href in pending:
+                    answer = await loop.run_in_executor(
+                        pool, client._fetch_answer, idx, conv_href, question, delay_between
+                    )
+                    if answer is not None:
+                        self._persist_answer(*answer, save_dir, jsonl_file)
+                        results[answer[0]] = answer[1]
+
+            jsonl_path = os.path.join(save_dir, "responses.jsonl")
+            with contextlib.ExitStack() as stack:
+                jsonl_file = None if per_file else stack.enter_context(
+                    open(jsonl_path, "w", encoding="utf-8", buffering=1024 * 1024)
+                )
+                try:
+                    await asyncio.gather(*(work(client) for client in clients))
+                finally:
+                    for helper in clients[1:]:
+                        await loop.run_in_executor(pool, helper.shutdown)
+
+        logger.info("🏁 Completed bulk-question run across history.")
+        return results
+
+    def _open_helper_client(self):
+        """
+        Start an extra browser for iterate_conversations_async, logged in from the saved cookie jar.
+        Returns the client, or None (after shutting it down) if it could not be started or logged in.
+        """
+        helper = None
+        try:
+            helper = OpenAIClient(profile_dir=None, headless=self.headless, driver_path=self.driver_path)
+            if helper.load_openai_cookies() and helper.is_logged_in():
+                return helper
+            logger.warning("⚠️ Helper browser could not log in with the saved cookies; skipping it.")
+        except Exception as e:
+            logger.error(f"❌ Failed to start helper browser: {e}")
+        if helper is not None:
+            helper.shutdown()
+        return None
+
+    def _snapshot_conversations(self, max_threads=None):
+        """
+        Open the main chat page and return the sidebar conversation hrefs (first max_threads of them),
+        or None if not logged in.
+        """
         logger.info("🔄 Starting bulk-question run across conversation history…")
 
         if not self.is_logged_in():
             logger.error("❌ Cannot iterate conversations: not logged in.")
-            return {}
+            return None
 
         # Make sure we are on the main chat page so the sidebar is present.
         self.driver.get(self.CHATGPT_URL)
         time.sleep(3)
 
+        # Snapshot sidebar link targets up front: WebElements go stale once we navigate away.
+        conv_hrefs = [
+            link.get_attribute("href")
+            for link in self.driver.find_elements(*CONVERSATION_LINKS)
+        ]
+        logger.info(f"📋 Found {len(conv_hrefs)} conversation links in sidebar.")
+        if max_threads is not None:
+            conv_hrefs = conv_hrefs[:max_threads]
+        return conv_hrefs
+
+    def _iter_conversations(self, question, delay_between=3, max_threads=None, save_dir="conversation_queries",
+                            per_file=False):
+        """
+        Generator behind iterate_conversations: yields (conv_id, response_text) as each answer is saved,
+        so callers that stream results elsewhere do not keep every response in memory.
+        """
+        conv_hrefs = self._snapshot_conversations(max_threads)
+        if conv_hrefs is None:
+            return
+
         os.makedirs(save_dir, exist_ok=True)
-        results = {}
 
-        # Collect sidebar links to conversation threads.
-        conv_links = self.driver.find_elements(By.CSS_SELECTOR, "nav a[href^='/c/']")
-        logger.info(f"📋 Found {len(conv_links)} conversation links in sidebar.")
+        jsonl_path = os.path.join(save_dir, "responses.jsonl")
+        with contextlib.ExitStack() as stack:
+            jsonl_file = None if per_file else stack.enter_context(
+                open(jsonl_path, "w", encoding="utf-8", buffering=1024 * 1024)
+            )
+            for idx, conv_href in enumerate(conv_hrefs):
+                answer = self._ask_conversation(idx, conv_href, question, delay_between, save_dir, jsonl_file)
+                if answer is not None:
+                    yield answer
 
-        for idx, link in enumerate(conv_links):
-            if max_threads is not None and idx >= max_threads:
-                break
-            try:
-                # Extract identifier for logging and filenames.
-                conv_href = link.get_attribute("href")
-                conv_id = conv_href.split("/c/")[-1].strip("/") or f"thread_{idx}"
+        logger.info("🏁 Completed bulk-question run across history.")
 
-                logger.info(f"➡️ Opening conversation {idx + 1}: {conv_id}")
-                self.driver.execute_script("arguments[0].click();", link)
-                time.sleep(delay_between)
+    def _ask_conversation(self, idx, conv_href, question, delay_between, save_dir, jsonl_file):
+        """
+        Open one conversation, ask the question and persist the answer.
+        Returns (conv_id, response_text), or None if the conversation could not be processed.
+        """
+        answer = self._fetch_answer(idx, conv_href, question, delay_between)
+        if answer is not None:
+            self._persist_answer(*answer, save_dir, jsonl_file)
+        return answer
 
-                # Ask the question inside this thread.
-                response_text = self.get_chatgpt_response(question)
-                results[conv_id] = response_text
+    def _fetch_answer(self, idx, conv_href, question, delay_between):
+        """
+        Open one conversation and ask the question.
+        Returns (conv_id, response_text), or None if the conversation could not be processed.
+        """
+        try:
+            # Extract identifier for logging and filenames.
+            conv_id = conv_href.split("/c/")[-1].strip("/") or f"thread_{idx}"
+
+            logger.info(f"➡️ Opening conversation {idx + 1}: {conv_id}")
+            self.driver.get(conv_href)
+            time.sleep(delay_between)
+
+            # Ask the question inside this thread (already open, so no reload).
+            return conv_id, self.get_chatgpt_response(question, navigate=False)
+        except Exception as e:
+            logger.error(f"❌ Failed while processing conversation {idx + 1}: {e}")
+            return None
 
-                # Persist to individual file for offline review.
+    def _persist_answer(self, conv_id, response_text, save_dir, jsonl_file):
+        """
+        Append the answer to jsonl_file, or write it to <save_dir>/<conv_id>.txt when jsonl_file is None.
+        Failures are logged; as before, an answer is kept even if persisting it failed.
+        """
+        try:
+            if jsonl_file is not None:
+                # One line per conversation in the shared, buffered output file.
+                jsonl_file.write(json.dumps({"id": conv_id, "response": response_text}) + "\n")
+                logger.info(f"✅ Saved answer for {conv_id} → {jsonl_file.name}")
+            else:
+                # Persist to individual file for offline review, with a single raw write.
                 out_path = os.path.join(save_dir, f"{conv_id}.txt")
-                with open(out_path, "w", encoding="utf-8") as fh:
-                    fh.write(response_text)
+                fd = os.open(out_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0), 0o644)
+                try:
+                    data = memoryview(response_text.encode("utf-8"))
+                    while data:
+                        data = data[os.write(fd, data):]
+                finally:
+                    os.close(fd)
                 logger.info(f"✅ Saved answer for {conv_id} → {out_path}")
-            except Exception as e:
-                logger.error(f"❌ Failed while processing conversation {idx + 1}: {e}")
-
-        logger.info("🏁 Completed bulk-question run across history.")
-        return results
+        except Exception as e:
+            logger.error(f"❌ Failed to save answer for {conv_id}: {e}")
 
     def get_full_response_for_debug(self, timeout=120):
         """
@@ -1,32 +1,64 @@
+import hashlib
+import io
 import os
+import re
+import sys
+import importlib.util
 import subprocess
 import tempfile
-import coverage
-from pylint import epylint as lint
 from typing import Tuple, Dict
 
 class PostProcessValidator:
+    _SCORE_RE = re.compile(r"rated at (-?\d+(?:\.\d+)?)/10")
+
+    # Coverage results keyed by (absolute path, mtime_ns); an unchanged file is not re-executed
+    _coverage_cache = {}
+
     def __init__(self, helpers=None):
         self.helpers = helpers  # Optional, for centralized logging or notifications
 
     def run_test_coverage(self, file_path: str) -> Tuple[bool, float, str]:
         """Run coverage on the target file, return (success, coverage_percent, output_log)."""
-        cov = coverage.Coverage(source=[os.path.dirname(file_path)])
+        abs_path = os.path.abspath(file_path)
+        try:
+            cache_key = (abs_path, os.stat(abs_path).st_mtime_ns)
+        except OSError as e:
+            return False, 0.0, f"Failed to run tests: {e}"
+        cached = self._coverage_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = self._measure_coverage(abs_path)
+        if result[0]:
+            self._coverage_cache[cache_key] = result
+        return result
+
+    def _measure_coverage(self, file_path: str) -> Tuple[bool, float, str]:
+        # Imported lazily: coverage is only needed when this check actually runs
+        import coverage
+
+        # Measure only the target file, and keep the data in memory (no .coverage file is written)
+        cov = coverage.Coverage(data_file=None, include=[file_path])
         cov.start()
 
-        module_name = os.path.splitext(os.path.basename(file_path))[0]
+        # A private, per-path name: registering the file under its basename could shadow a
+        # stdlib module (json.py, typing.py, ...) for the rest of the process
+        module_name = "_ppv_" + hashlib.sha1(file_path.encode("utf-8")).hexdigest()[:16]
 
         try:
-            # Dynamically import & test the file (assumes tests exist in the same dir or nearby)
-            exec(f"import {module_name}")
+            # Load & execute the file itself (assumes tests exist in the same dir or nearby)
+            spec = importlib.util.spec_from_file_location(module_name, file_path)
+            module = importlib.util.module_from_spec(spec)
+            sys.modules[module_name] = module
+            spec.loader.exec_module(module)
             success = True
         except Exception as e:
             cov.stop()
-            cov.save()
             return False, 0.0, f"Failed to run tests: {e}"
+        finally:
+            sys.modules.pop(module_name, None)
 
         cov.stop()
-        cov.save()
 
         try:
             coverage_percent = cov.report(show_missing=True)
@@ -41,8 +73,13 @@ class PostProcessValidator:
 
     def run_pylint(self, file_path: str) -> Tuple[bool, float, str]:
         """Run pylint and return (success, score, output_log)."""
-        pylint_stdout, pylint_stderr = lint.py_run(file_path + ' --score=y', return_std=True)
-        output = pylint_stdout.getvalue()
+        # In-process run: no interpreter startup, and astroid's module cache is reused across files
+        from pylint.lint import Run
+        from pylint.reporters.text import TextReporter
+
+        buffer = io.StringIO()
+        Run([file_path, '--score=y'], reporter=TextReporter(buffer), exit=False)
+        output = buffer.getvalue()
 
         score = self.extract_pylint_score(output)
         success = score >= 8.0  # Arbitrary pass threshold
@@ -51,35 +88,71 @@ class PostProcessValidator:
 
     def extract_pylint_score(self, pylint_output: str) -> float:
         """Extract the score from pylint output."""
-        for line in pylint_output.splitlines():
-            if "Your code has been rated at" in line:
-                try:
-                    score_str = line.split("rated at")[1].split("/")[0].strip()
-                    return float(score_str)
-                except (IndexError, ValueError):
-                    continue
-        return 0.0
+        match = self._SCORE_RE.search(pylint_output)
+        return float(match.group(1)) if match else 0.0
 
     def run_mypy(self, file_path: str) -> Tuple[bool, str]:
         """Run mypy and return (success, output_log)."""
-        result = subprocess.run(['mypy', file_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        success = result.returncode == 0
-        output = result.stdout + "\n" + result.stderr
+        try:
+            from mypy import api as mypy_api
+        except ImportError:
+            # mypy not importable here (e.g. installed via pipx); fall back to the CLI
+            result = subprocess.run(['mypy', file_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            return result.returncode == 0, result.stdout + "\n" + result.stderr
 
-        return success, output
+        stdout, stderr, returncode = mypy_api.run([file_path])
+        return returncode == 0, stdout + "\n" + stderr
 
     def run_black_check(self, file_path: str) -> Tuple[bool, str]:
         """Run black in check mode (format validation only)."""
-        result = subprocess.run(['black', '--check', file_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
-        success = result.returncode == 0
-        output = result.stdout + "\n" + result.stderr
+        try:
+            import black
+        except ImportError:
+            # black not importable here (e.g. installed via pipx); fall back to the CLI
+            result = subprocess.run(['black', '--check', file_path], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+            return result.returncode == 0, result.stdout + "\n" + result.stderr
 
-        return success, output
+        try:
+            mode = self._black_mode(black, file_path)
+            # Decoded the way black decodes files itself (encoding cookie, universal newlines)
+            with open(file_path, "rb") as f:
+                raw = f.read()
+            try:
+                source = black.decode_bytes(raw, mode)[0]
+            except TypeError:  # black < 24 takes no mode argument
+                source = black.decode_bytes(raw)[0]
+            black.format_file_contents(source, fast=False, mode=mode)
+        except black.NothingChanged:
+            return True, f"{file_path} already well formatted, good job."
+        except Exception as e:
+            return False, f"error: cannot format {file_path}: {e}"
+        return False, f"would reformat {file_path}"
+
+    @staticmethod
+    def _black_mode(black, file_path: str):
+        """Builds black's Mode from the nearest pyproject.toml's [tool.black] table, as `black --check` does."""
+        pyproject = black.find_pyproject_toml((os.path.dirname(os.path.abspath(file_path)),))
+        config = black.parse_pyproject_toml(pyproject) if pyproject else {}
+        target_versions = config.get("target_version", ())
+        if isinstance(target_versions, str):
+            target_versions = [target_versions]
+        return black.Mode(
+            target_versions={black.TargetVersion[version.upper()] for version in target_versions},
+            line_length=config.get("line_length", black.DEFAULT_LINE_LENGTH),
+            string_normalization=not config.get("skip_string_normalization", False),
+            magic_trailing_comma=not config.get("skip_magic_trailing_comma", False),
+            is_pyi=config.get("pyi", False) or file_path.endswith(".pyi"),
+            preview=config.get("preview", False),
+        )
 
     def run_full_validation(self, file_path: str) -> Dict:
         """Run all checks on the given file and return detailed report."""
         report = {}
 
+        # The checks run in-process one after another: pylint mutates sys.path, and coverage
+        # executes the file under a global tracer and reports to stdout, so none of them may
+        # overlap with another
+
         # ✅ Run Test Coverage
         test_success, test_coverage, test_log = self.run_test_coverage(file_path)
         report['test_coverage'] = {
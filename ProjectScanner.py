@@ -2,8 +2,10 @@ import os
 import ast
 import json
 import hashlib
+import itertools
+import mmap
 import threading
-import queue
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, Union
 
@@ -15,40 +17,101 @@ except ImportError:
     Parser = None
     print("⚠️ tree-sitter not installed. Rust/JS/TS AST parsing will be partially disabled.")
 
+# orjson (optional) parses/serializes the cache and report in C, several times faster than json
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Content fingerprints only need to be fast and collision-resistant, not secure:
+# prefer BLAKE3 when installed, otherwise SHA-256 (hardware-accelerated on modern CPUs).
+try:
+    from blake3 import blake3 as _hasher
+    HASH_ALGO = "blake3"
+except ImportError:
+    _hasher = None
+    HASH_ALGO = "sha256"
+
 CACHE_FILE = "dependency_cache.json"
 
+# tree-sitter queries for the Rust/JS analyzers; capture names select the handler
+RUST_QUERY = """
+(function_item name: (identifier) @function)
+(struct_item name: (type_identifier) @struct)
+(impl_item) @impl
+"""
+JS_QUERY = """
+(function_declaration name: (identifier) @function)
+(class_declaration name: (_) @class)
+(lexical_declaration (variable_declarator name: (_) @function value: (arrow_function)))
+(call_expression function: (member_expression) arguments: (arguments)) @route
+"""
+
+# Block size used when hashing files incrementally
+HASH_CHUNK_SIZE = 1 << 20
+
+# Files at least this large are hashed through a read-only memory map (not on Windows,
+# where mapping costs more than it saves); smaller files are streamed.
+MMAP_HASH_MIN_SIZE = 64 * 1024
+
+# Number of files handed to a pool worker per task
+SCAN_CHUNK_SIZE = 32
+
+# Extensions (without the dot, lower-case) of the files the scanner analyzes
+SOURCE_EXTENSIONS = frozenset({"py", "rs", "js", "ts"})
+# Every capitalization of each extension, dotted, for a single case-sensitive str.endswith test
+SOURCE_SUFFIXES = tuple(
+    "." + "".join(chars)
+    for ext in sorted(SOURCE_EXTENSIONS)
+    for chars in itertools.product(*((c.lower(), c.upper()) for c in ext))
+)
+
 
 class ProjectScanner:
     """
     A universal project scanner that:
       - Identifies Python, Rust, JavaScript, and TypeScript files.
       - Extracts functions, classes, and naive route definitions.
-      - Caches file hashes to skip unchanged files.
+      - Caches file hashes (BLAKE3 or SHA-256) to skip unchanged files.
       - Detects moved files by matching file hashes.
       - Writes a single JSON report (project_analysis.json) at the end.
-      - Processes files asynchronously via background workers (BotWorker/MultibotManager).
+      - Analyzes new or changed files in parallel worker processes (threads on Windows).
       
     Extend or refactor `_save_report()` for modular outputs (e.g., routes.json, summary.md, etc.).
     """
-    def __init__(self, project_root: Union[str, Path] = "."):
+    # Directory names that are never descended into
+    DEFAULT_EXCLUDE_DIRS = frozenset({
+        "venv", "__pycache__", "node_modules", "migrations", "build", "target", ".git", "coverage", "chrome_profile"
+    })
+
+    def __init__(self, project_root: Union[str, Path] = ".", load_cache: bool = True, pretty: bool = False):
         """
         :param project_root: The root directory of the project to scan.
+        :param load_cache: Whether to read the hash cache from disk (worker processes skip it).
+        :param pretty: Write the report and cache as indented, human-readable JSON.
         """
         self.project_root = Path(project_root).resolve()
+        self.pretty = pretty
         self.analysis: Dict[str, Dict] = {}
-        self.cache = self.load_cache()
-        self.cache_lock = threading.Lock()  # Protect cache updates in a threaded context
+        self.cache = self.load_cache() if load_cache else {}
         # Additional ignore directories provided interactively by the user.
         self.additional_ignore_dirs = set()
-
-        # Initialize tree-sitter parsers for Rust and JS (if available)
-        self.rust_parser = self._init_tree_sitter_language("rust")
-        self.js_parser = self._init_tree_sitter_language("javascript")
+        # (ignore dirs, resolved prefixes) memo for _ignore_prefixes()
+        self._ignore_prefix_cache = (frozenset(), ())
+
+        # Load tree-sitter grammars for Rust and JS once (if available); Parsers are not
+        # thread-safe, so each thread gets its own from _get_parser()
+        self.rust_language = self._init_tree_sitter_language("rust")
+        self.js_language = self._init_tree_sitter_language("javascript")
+        self._parsers = threading.local()
+        # Compile the extraction queries once; matching runs inside the tree-sitter runtime
+        self.rust_query = self.rust_language.query(RUST_QUERY) if self.rust_language else None
+        self.js_query = self.js_language.query(JS_QUERY) if self.js_language else None
 
     def _init_tree_sitter_language(self, lang_name: str):
         """
-        Initializes and returns a Parser for the given language name (e.g. "rust", "javascript")
-        if we have a compiled tree-sitter grammar.
+        Loads and returns the tree-sitter Language for the given language name (e.g. "rust", "javascript")
+        if we have a compiled grammar.
 
         Adjust the grammar_paths to point to your actual .so/.dll/.dylib files.
         """
@@ -72,114 +135,191 @@ class ProjectScanner:
             return None
 
         try:
-            lang_lib = Language(grammar_path, lang_name)
-            parser = Parser()
-            parser.set_language(lang_lib)
-            return parser
+            return Language(grammar_path, lang_name)
         except Exception as e:
             print(f"⚠️ Failed to initialize tree-sitter {lang_name} parser: {e}")
             return None
 
+    def _get_parser(self, language):
+        """
+        Returns the calling thread's Parser for a loaded Language, creating it on first use
+        so each parser is allocated once per thread and reused for every file.
+        """
+        parsers = self._parsers.__dict__
+        parser = parsers.get(language)
+        if parser is None:
+            parser = Parser()
+            parser.set_language(language)
+            parsers[language] = parser
+        return parser
+
     def load_cache(self) -> Dict:
         """
         Loads a JSON cache from disk if present.
         The cache stores file paths, hashes, etc. to skip re-analysis of unchanged files.
+        A cache written with a different hash algorithm (or in the old flat format) is discarded.
         """
         if Path(CACHE_FILE).exists():
             try:
-                with open(CACHE_FILE, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except json.JSONDecodeError:
+                raw = Path(CACHE_FILE).read_bytes()
+                data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            except (OSError, ValueError):  # includes json/orjson decode errors
                 return {}
+            if isinstance(data, dict) and data.get("hash_algo") == HASH_ALGO:
+                return data.get("files", {})
         return {}
 
+    def load_report(self) -> Dict:
+        """
+        Loads the previous project_analysis.json, so unchanged files can keep their analysis
+        without being re-parsed. The file is memory-mapped and handed to orjson as a buffer
+        (no intermediate copy); without orjson it is read as bytes for json.loads.
+        Returns {} if the report is missing or unreadable.
+        """
+        report_path = self.project_root / "project_analysis.json"
+        try:
+            with open(report_path, "rb") as f:
+                if orjson is not None and os.fstat(f.fileno()).st_size:
+                    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                        with memoryview(mm) as view:
+                            data = orjson.loads(view)
+                else:
+                    data = json.loads(f.read())
+        except (OSError, ValueError):  # includes json/orjson decode errors
+            return {}
+        return data if isinstance(data, dict) else {}
+
     def save_cache(self):
         """
         Writes the updated cache to disk so subsequent runs can detect unchanged or moved files quickly.
         """
-        with open(CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(self.cache, f, indent=4)
+        _write_json_atomic(Path(CACHE_FILE), {"hash_algo": HASH_ALGO, "files": self.cache}, self.pretty)
 
     def hash_file(self, file_path: Path) -> str:
         """
-        Calculates an MD5 hash of a file's content.
+        Calculates a HASH_ALGO fingerprint of a file's content. Large files are memory-mapped
+        and hashed in one update with no userspace copy; others are streamed in fixed-size
+        blocks so memory use does not grow with the file.
         :param file_path: Path to the file to hash.
         :return: Hex digest string, or "" if an error occurs.
         """
         try:
-            with file_path.open("rb") as f:
-                return hashlib.md5(f.read()).hexdigest()
+            with open(file_path, "rb", buffering=0) as f:
+                if os.name != "nt" and os.fstat(f.fileno()).st_size >= MMAP_HASH_MIN_SIZE:
+                    # MAP_POPULATE (Linux) pre-faults every page in one go; elsewhere hint sequential reads
+                    flags = mmap.MAP_SHARED | getattr(mmap, "MAP_POPULATE", 0)
+                    with mmap.mmap(f.fileno(), 0, flags=flags, prot=mmap.PROT_READ) as mm:
+                        if hasattr(mm, "madvise"):
+                            mm.madvise(mmap.MADV_SEQUENTIAL)
+                        digest = _hasher() if _hasher is not None else hashlib.sha256()
+                        digest.update(mm)
+                        return digest.hexdigest()
+                if _hasher is not None:
+                    digest = _hasher()
+                elif hasattr(hashlib, "file_digest"):  # Python 3.11+: C loop that releases the GIL
+                    return hashlib.file_digest(f, "sha256").hexdigest()
+                else:
+                    digest = hashlib.sha256()
+                buffer = memoryview(bytearray(HASH_CHUNK_SIZE))
+                while True:
+                    n = f.readinto(buffer)
+                    if not n:
+                        break
+                    digest.update(buffer[:n])
+                return digest.hexdigest()
         except Exception:
             return ""
 
-    def scan_project(self):
+    def fast_hash(self, file_path: Path, relative_path: str = None, st: os.stat_result = None) -> Dict:
+        """
+        Returns a cache entry {"hash", "mtime_ns", "size"} for a file. When the cached
+        entry for relative_path has the same mtime and size, its hash is reused without
+        reading the file; otherwise the file is hashed.
+        :param st: The file's stat result, if the caller already has one.
+        """
+        if st is None:
+            try:
+                st = os.stat(file_path)
+            except OSError:
+                return {"hash": ""}
+        cached = self.cache.get(relative_path) if relative_path is not None else None
+        if cached and cached.get("mtime_ns") == st.st_mtime_ns and cached.get("size") == st.st_size:
+            file_hash = cached["hash"]
+        else:
+            file_hash = self.hash_file(file_path)
+        return {"hash": file_hash, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+
+    def scan_project(self, use_processes: bool = os.name != "nt"):
         """
         Orchestrates the project scan:
-        - Finds Python, Rust, JS, and TS files using os.walk().
+        - Finds Python, Rust, JS, and TS files using os.fwalk() (os.scandir() where unavailable).
         - Excludes certain directories.
         - Detects moved files by comparing cached hashes.
-        - Offloads file analysis to background workers.
+        - Analyzes new or changed files as the walk discovers them, on a process pool
+          (parsing is CPU-bound and holds the GIL), or on a thread pool when use_processes
+          is False, where process startup is expensive (the default on Windows).
         - Saves a single JSON report 'project_analysis.json'.
         """
         print(f"🔍 Scanning project: {self.project_root} ...")
 
-        # Collect files using os.walk to capture all files (even in hidden directories)
-        file_extensions = {'.py', '.rs', '.js', '.ts'}
-        valid_files = []
-        for root, dirs, files in os.walk(self.project_root):
-            root_path = Path(root)
-            # Skip directories that should be excluded
-            if self._should_exclude(root_path):
-                continue
-            for file in files:
-                file_path = root_path / file
-                if file_path.suffix.lower() in file_extensions and not self._should_exclude(file_path):
-                    valid_files.append(file_path)
-        
-        print(f"📝 Found {len(valid_files)} valid files for analysis.")
-
-        # Track old vs. new paths for cache update
         previous_files = set(self.cache.keys())
-        current_files = {str(f.relative_to(self.project_root)) for f in valid_files}
-        moved_files = {}
-        missing_files = previous_files - current_files
-
-        # Detect moved files by matching file hashes
-        for old_path in previous_files:
-            old_hash = self.cache.get(old_path, {}).get("hash")
-            if not old_hash:
-                continue
-            for new_path in current_files:
-                new_file = self.project_root / new_path
-                if self.hash_file(new_file) == old_hash:
-                    moved_files[old_path] = new_path
-                    break
-
-        # Remove truly missing files from cache
-        for missing_file in missing_files:
-            if missing_file not in moved_files:
-                with self.cache_lock:
-                    if missing_file in self.cache:
-                        del self.cache[missing_file]
-
-        # Update cache for moved files
-        for old_path, new_path in moved_files.items():
-            with self.cache_lock:
-                self.cache[new_path] = self.cache.pop(old_path)
-
-        # --- Asynchronous processing with BotWorker/MultibotManager ---
-        print("⏱️  Processing files asynchronously...")
+        # Unchanged files carry their previous analysis forward, so the report covers the whole project
+        previous_report = self.load_report() if self.cache else {}
+        cached_hashes = {meta.get("hash") for meta in self.cache.values()} - {None, ""}
+        current_entries = {}
+        maybe_moved = []
+        tasks = []
+
         num_workers = os.cpu_count() or 4
-        manager = MultibotManager(scanner=self, num_workers=num_workers,
-                                status_callback=lambda fp, res: print(f"Processed: {fp}"))
-        for file_path in valid_files:
-            manager.add_task(file_path)
-        manager.wait_for_completion()
-        manager.stop_workers()
-        for result in manager.results_list:
-            if result is not None:
-                file_path, analysis_result = result
-                self.analysis[file_path] = analysis_result
+        if use_processes:
+            executor = ProcessPoolExecutor(max_workers=num_workers, initializer=_init_worker,
+                                           initargs=(self.project_root,))
+        else:
+            executor = ThreadPoolExecutor(max_workers=num_workers)
+        with executor:
+            # The walk feeds the pool as it goes: chunks of new or changed files are submitted
+            # (and start parsing) while later directories are still being enumerated
+            results = self._map_tasks(
+                executor, use_processes,
+                self._iter_changed_files(current_entries, maybe_moved, tasks, cached_hashes, previous_report)
+            )
+            print(f"📝 Found {len(current_entries)} valid files for analysis.")
+
+            # Detect moved files with a reverse index of the hashes of paths that disappeared
+            missing_files = previous_files - current_entries.keys()
+            old_by_hash = {}
+            for old_path in missing_files:
+                old_by_hash.setdefault(self.cache[old_path].get("hash"), old_path)
+            moved_files = set()
+            unmatched = []
+            for file_path, rel_path in maybe_moved:
+                old_path = old_by_hash.pop(current_entries[rel_path]["hash"], None)
+                if old_path:
+                    moved_files.add(old_path)
+                    self.cache[rel_path] = self.cache.pop(old_path)
+                    self.cache[rel_path].update(current_entries[rel_path])
+                    if old_path in previous_report:
+                        self.analysis[rel_path] = previous_report[old_path]
+                    else:
+                        unmatched.append((file_path, rel_path))
+                else:
+                    unmatched.append((file_path, rel_path))  # a copy, not a move: analyze it
+
+            # Remove truly missing files from cache
+            for missing_file in missing_files - moved_files:
+                self.cache.pop(missing_file, None)
+
+            if unmatched:
+                tasks.extend(unmatched)
+                results = itertools.chain(results, self._map_tasks(executor, use_processes, unmatched))
+
+            # --- Results and cache updates are merged here, in the parent ---
+            print(f"⏱️  Processing {len(tasks)} new or changed files in parallel...")
+            for (file_path, rel_path), analysis_result in zip(tasks, results):
+                print(f"Processed: {file_path}")
+                if analysis_result is not None:
+                    self.analysis[rel_path] = analysis_result
+                    self.cache[rel_path] = current_entries[rel_path]
 
         # Write final report and cache
         self._save_report()
@@ -187,54 +327,129 @@ class ProjectScanner:
         print(f"✅ Scan complete. Results saved to {self.project_root / 'project_analysis.json'}")
 
 
-    def _should_exclude(self, file_path: Path) -> bool:
+    def _iter_changed_files(self, current_entries: Dict, maybe_moved: list, tasks: list, cached_hashes: set,
+                            previous_report: Dict):
         """
-        Excludes files that are located inside certain directories.
-        Combines a default list of excluded directory names with any additional
-        directories specified by the user. For additional directories, if the user
-        provides an absolute path, the file's absolute path is checked against it.
-        Otherwise, the path is assumed to be relative to the project root.
+        Walks the project and yields (file_path, relative_path) for every new or modified file,
+        recording each one in tasks. Along the way every file's fast_hash() entry is stored in
+        current_entries, and unchanged files are settled in the cache (refreshing mtime/size
+        so the next scan skips hashing them) with their analysis copied from previous_report;
+        an unchanged file missing from the previous report is analyzed again. New paths whose content matches a cached hash
+        may be moves; they are held back in maybe_moved until the walk is complete.
         """
-        default_exclude_dirs = {"venv", "__pycache__", "node_modules", "migrations", "build", "target", ".git", "coverage", "chrome_profile"}
-        file_abs = file_path.resolve()
-        for ignore in self.additional_ignore_dirs:
-            ignore_path = Path(ignore)
-            if not ignore_path.is_absolute():
-                ignore_path = (self.project_root / ignore_path).resolve()
+        for path, st in self._iter_source_files():
+            file_path = Path(path)
+            rel_path = str(file_path.relative_to(self.project_root))
+            entry = self.fast_hash(file_path, rel_path, st)
+            current_entries[rel_path] = entry
+            cached = self.cache.get(rel_path)
+            if cached is not None and cached["hash"] == entry["hash"] and rel_path in previous_report:
+                cached.update(entry)
+                self.analysis[rel_path] = previous_report[rel_path]
+                continue
+            if cached is None and entry["hash"] in cached_hashes:
+                maybe_moved.append((file_path, rel_path))
+                continue
+            tasks.append((file_path, rel_path))
+            yield file_path, rel_path
+
+    def _map_tasks(self, executor, use_processes: bool, tasks):
+        """
+        Submits (file_path, relative_path) tasks to the executor in chunks of SCAN_CHUNK_SIZE,
+        consuming the tasks iterable as it goes, and returns an iterator of analysis results
+        in task order.
+        """
+        if use_processes:
+            return executor.map(_process_file_task, tasks, chunksize=SCAN_CHUNK_SIZE)
+        # ThreadPoolExecutor.map ignores chunksize, so chunk explicitly
+        return itertools.chain.from_iterable(executor.map(self._process_chunk, _chunked(tasks, SCAN_CHUNK_SIZE)))
+
+    def _iter_source_files(self):
+        """
+        Yields (path, stat_result) for all analyzable files under the project root, including
+        hidden directories, pruning excluded directories before descending into them.
+        Where available (Linux, macOS, BSD) os.fwalk is used, so each file is stat'ed relative
+        to its already-open directory fd instead of re-resolving the full path; elsewhere a
+        stack of os.scandir calls is used, whose DirEntry.stat() is free on Windows.
+        stat_result is None if the file could not be stat'ed. Unreadable directories are
+        skipped and symlinked directories are not followed, as with os.walk.
+        """
+        ignore_prefixes = self._ignore_prefixes()
+        if hasattr(os, "fwalk"):
+            for root, dirs, files, dirfd in os.fwalk(str(self.project_root)):
+                dirs[:] = [
+                    d for d in dirs
+                    if d not in self.DEFAULT_EXCLUDE_DIRS
+                    and not os.path.join(root, d, "").startswith(ignore_prefixes)
+                ]
+                for name in files:
+                    if name.endswith(SOURCE_SUFFIXES):
+                        try:
+                            st = os.stat(name, dir_fd=dirfd)
+                        except OSError:
+                            st = None
+                        yield os.path.join(root, name), st
+            return
+
+        pending = [str(self.project_root)]
+        while pending:
             try:
-                file_abs.relative_to(ignore_path)
-                return True
-            except ValueError:
+                with os.scandir(pending.pop()) as entries:
+                    for entry in entries:
+                        if entry.is_dir():
+                            if (not entry.is_symlink()
+                                    and entry.name not in self.DEFAULT_EXCLUDE_DIRS
+                                    and not (entry.path + os.sep).startswith(ignore_prefixes)):
+                                pending.append(entry.path)
+                        elif entry.name.endswith(SOURCE_SUFFIXES):
+                            try:
+                                st = entry.stat()
+                            except OSError:
+                                st = None
+                            yield entry.path, st
+            except OSError:
                 continue
-        if any(excluded in file_path.parts for excluded in default_exclude_dirs):
-            return True
-        return False
-
-    def _process_file(self, file_path: Path):
-        """
-        Handles analysis of a single file:
-          - Skips if the file is unchanged (hash match).
-          - Reads its source, dispatches to the appropriate parser.
-          - Updates the cache with the new hash.
-        Returns a tuple (relative_path, analysis_result) or None on error/skip.
-        """
-        file_hash = self.hash_file(file_path)
-        relative_path = str(file_path.relative_to(self.project_root))
-        with self.cache_lock:
-            if relative_path in self.cache and self.cache[relative_path]["hash"] == file_hash:
-                return None
+
+    def _ignore_prefixes(self) -> tuple:
+        """
+        Resolves the user-provided ignore directories into absolute path prefixes (each
+        ending in a separator) for cheap str.startswith tests. Relative entries are taken
+        to be relative to the project root. The result is memoized until
+        additional_ignore_dirs changes, so resolve() runs once per ignore directory.
+        """
+        ignore_dirs = frozenset(self.additional_ignore_dirs)
+        cached_dirs, prefixes = self._ignore_prefix_cache
+        if ignore_dirs == cached_dirs:
+            return prefixes
+        resolved = []
+        for ignore in ignore_dirs:
+            ignore_path = Path(ignore)
+            if not ignore_path.is_absolute():
+                ignore_path = self.project_root / ignore_path
+            resolved.append(str(ignore_path.resolve()).rstrip(os.sep) + os.sep)
+        prefixes = tuple(resolved)
+        self._ignore_prefix_cache = (ignore_dirs, prefixes)
+        return prefixes
+
+    def _process_chunk(self, chunk) -> list:
+        """Thread-pool entry point: analyzes a list of (file_path, relative_path) tasks in order."""
+        return [self._process_file(file_path, relative_path) for file_path, relative_path in chunk]
+
+    def _process_file(self, file_path: Path, relative_path: str) -> Union[Dict, None]:
+        """
+        Reads a single file's source as raw bytes (both ast.parse and tree-sitter accept
+        bytes, so it is never decoded or re-encoded) and dispatches it to the appropriate parser.
+        Does not touch the cache; the caller records the file's entry once analysis succeeds.
+        Returns the analysis result, or None on error.
+        """
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                source_code = f.read()
-            analysis_result = self._analyze_file_by_language(file_path, source_code)
-            with self.cache_lock:
-                self.cache[relative_path] = {"hash": file_hash}
-            return (relative_path, analysis_result)
+            source_bytes = file_path.read_bytes()
+            return self._analyze_file_by_language(file_path, source_bytes)
         except Exception as e:
-            print(f"❌ Error analyzing {file_path}: {e}")
+            print(f"❌ Error analyzing {relative_path}: {e}")
             return None
 
-    def _analyze_file_by_language(self, file_path: Path, source_code: str) -> Dict:
+    def _analyze_file_by_language(self, file_path: Path, source_bytes: bytes) -> Dict:
         """
         Dispatches analysis based on file extension and available parsers.
         Returns a dictionary with keys like:
@@ -248,7 +463,7 @@ class ProjectScanner:
         """
         suffix = file_path.suffix.lower()
         if suffix == ".py":
-            data = self._analyze_python(source_code)
+            data = self._analyze_python(source_bytes)
             complexity = len(data["functions"]) + sum(len(methods) for methods in data["classes"].values())
             return {
                 "language": "python",
@@ -257,8 +472,8 @@ class ProjectScanner:
                 "routes": data.get("routes", []),
                 "complexity": complexity,
             }
-        elif suffix == ".rs" and self.rust_parser:
-            data = self._analyze_rust(source_code)
+        elif suffix == ".rs" and self.rust_language:
+            data = self._analyze_rust(source_bytes)
             complexity = len(data["functions"]) + sum(len(methods) for methods in data["classes"].values())
             return {
                 "language": "rust",
@@ -266,8 +481,8 @@ class ProjectScanner:
                 "classes": data["classes"],
                 "complexity": complexity,
             }
-        elif suffix in [".js", ".ts"] and self.js_parser:
-            data = self._analyze_javascript(source_code)
+        elif suffix in [".js", ".ts"] and self.js_language:
+            data = self._analyze_javascript(source_bytes)
             complexity = len(data["functions"]) + sum(len(methods) for methods in data["classes"].values())
             return {
                 "language": "javascript",
@@ -279,203 +494,190 @@ class ProjectScanner:
         else:
             return {"language": suffix, "functions": [], "classes": {}, "routes": [], "complexity": 0}
 
-    def _analyze_python(self, source_code: str) -> Dict:
+    def _analyze_python(self, source_bytes: bytes) -> Dict:
         """
         Uses Python's ast to extract:
-          - function names
+          - function names (module level and class methods)
           - class names and method names
           - Naive route detection (Flask-like decorators)
+        Only module and class bodies are visited (breadth-first, nested classes included);
+        function bodies are never descended into.
         """
-        tree = ast.parse(source_code)
+        tree = ast.parse(source_bytes)  # honours a BOM or coding declaration
         functions = []
         classes = {}
         routes = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                functions.append(node.name)
-                for decorator in node.decorator_list:
-                    if isinstance(decorator, ast.Call) and hasattr(decorator.func, 'attr'):
-                        func_attr = decorator.func.attr.lower()
-                        if func_attr in {"route", "get", "post", "put", "delete", "patch"}:
-                            path_arg = "/unknown"
-                            methods = [func_attr.upper()]
-                            if decorator.args:
-                                arg0 = decorator.args[0]
-                                if isinstance(arg0, ast.Str):
-                                    path_arg = arg0.s
-                            for kw in decorator.keywords:
-                                if kw.arg == "methods" and isinstance(kw.value, ast.List):
-                                    extracted_methods = []
-                                    for elt in kw.value.elts:
-                                        if isinstance(elt, ast.Str):
-                                            extracted_methods.append(elt.s.upper())
-                                    if extracted_methods:
-                                        methods = extracted_methods
-                            for m in methods:
-                                routes.append({
-                                    "function": node.name,
-                                    "method": m,
-                                    "path": path_arg
-                                })
-            elif isinstance(node, ast.ClassDef):
-                method_names = [m.name for m in node.body if isinstance(m, ast.FunctionDef)]
-                classes[node.name] = method_names
+        bodies = [tree.body]
+        for body in bodies:  # grows as class bodies are found
+            for node in body:
+                # Exact type checks: ast node classes are never subclassed by the parser
+                node_type = type(node)
+                if node_type is ast.FunctionDef:
+                    functions.append(node.name)
+                    for decorator in node.decorator_list:
+                        if type(decorator) is ast.Call:
+                            routes.extend(_decorator_routes(node.name, decorator))
+                elif node_type is ast.ClassDef:
+                    method_names = [m.name for m in node.body if type(m) is ast.FunctionDef]
+                    classes[node.name] = method_names
+                    bodies.append(node.body)
         return {"functions": functions, "classes": classes, "routes": routes}
 
-    def _analyze_rust(self, source_code: str) -> Dict:
+    def _analyze_rust(self, source_bytes: bytes) -> Dict:
         """
-        Uses tree-sitter to extract functions and struct methods from Rust code.
+        Uses a tree-sitter query to extract functions and struct methods from Rust code.
         """
-        if not self.rust_parser:
+        if not self.rust_language:
             return {"functions": [], "classes": {}}
-        tree = self.rust_parser.parse(bytes(source_code, "utf-8"))
+        tree = self._get_parser(self.rust_language).parse(source_bytes)
         functions = []
         classes = {}
 
-        def _traverse(node):
-            if node.type == "function_item":
-                fn_name_node = node.child_by_field_name("name")
-                if fn_name_node:
-                    functions.append(fn_name_node.text.decode("utf-8"))
-            elif node.type == "struct_item":
-                struct_name_node = node.child_by_field_name("name")
-                if struct_name_node:
-                    classes[struct_name_node.text.decode("utf-8")] = []
-            elif node.type == "impl_item":
+        for node, capture in _query_captures(self.rust_query, tree.root_node):
+            if capture == "function":
+                functions.append(node.text.decode("utf-8"))
+            elif capture == "struct":
+                classes[node.text.decode("utf-8")] = []
+            else:  # impl
                 impl_type_node = node.child_by_field_name("type")
+                body_node = node.child_by_field_name("body")
                 if impl_type_node:
-                    impl_name = impl_type_node.text.decode("utf-8")
-                    if impl_name not in classes:
-                        classes[impl_name] = []
-                    for child in node.children:
+                    methods = classes.setdefault(impl_type_node.text.decode("utf-8"), [])
+                    for child in (body_node.named_children if body_node else ()):
                         if child.type == "function_item":
                             method_node = child.child_by_field_name("name")
                             if method_node:
-                                classes[impl_name].append(method_node.text.decode("utf-8"))
-            for child in node.children:
-                _traverse(child)
-
-        _traverse(tree.root_node)
+                                methods.append(method_node.text.decode("utf-8"))
         return {"functions": functions, "classes": classes}
 
-    def _analyze_javascript(self, source_code: str) -> Dict:
+    def _analyze_javascript(self, source_bytes: bytes) -> Dict:
         """
-        Uses tree-sitter to extract functions, classes, and basic Express-style routes from JavaScript/TypeScript code.
+        Uses a tree-sitter query to extract functions, classes, and basic Express-style routes
+        from JavaScript/TypeScript code.
         """
-        if not self.js_parser:
+        if not self.js_language:
             return {"functions": [], "classes": {}, "routes": []}
-        tree = self.js_parser.parse(bytes(source_code, "utf-8"))
-        root = tree.root_node
+        tree = self._get_parser(self.js_language).parse(source_bytes)
         functions = []
         classes = {}
         routes = []
 
-        def get_node_text(node):
-            return node.text.decode("utf-8")
-
-        def _traverse(node):
-            if node.type == "function_declaration":
-                name_node = node.child_by_field_name("name")
-                if name_node:
-                    functions.append(get_node_text(name_node))
-            elif node.type == "class_declaration":
-                name_node = node.child_by_field_name("name")
-                if name_node:
-                    cls_name = get_node_text(name_node)
-                    classes[cls_name] = []
-            elif node.type == "lexical_declaration":
-                for child in node.children:
-                    if child.type == "variable_declarator":
-                        name_node = child.child_by_field_name("name")
-                        value_node = child.child_by_field_name("value")
-                        if name_node and value_node and value_node.type == "arrow_function":
-                            functions.append(get_node_text(name_node))
-            elif node.type == "call_expression":
-                if node.child_count >= 2:
-                    callee_node = node.child_by_field_name("function")
-                    args_node = node.child_by_field_name("arguments")
-                    if callee_node:
-                        callee_text = get_node_text(callee_node)
-                        parts = callee_text.split(".")
-                        if len(parts) == 2:
-                            obj, method = parts
-                            if method.lower() in {"get", "post", "put", "delete", "patch"}:
-                                path_str = "/unknown"
-                                if args_node and args_node.child_count > 0:
-                                    first_arg = args_node.child(0)
-                                    if first_arg.type == "string":
-                                        path_str = get_node_text(first_arg).strip('"\'')
-                                routes.append({
-                                    "object": obj,
-                                    "method": method.upper(),
-                                    "path": path_str
-                                })
-            for child in node.children:
-                _traverse(child)
-
-        _traverse(root)
+        for node, capture in _query_captures(self.js_query, tree.root_node):
+            if capture == "function":
+                functions.append(node.text.decode("utf-8"))
+            elif capture == "class":
+                classes[node.text.decode("utf-8")] = []
+            else:  # route candidate: obj.method(...) call
+                parts = node.child_by_field_name("function").text.decode("utf-8").split(".")
+                if len(parts) == 2:
+                    obj, method = parts
+                    if method.lower() in _EXPRESS_ROUTE_VERBS:
+                        path_str = "/unknown"
+                        args = node.child_by_field_name("arguments").named_children
+                        if args and args[0].type == "string":
+                            path_str = args[0].text.decode("utf-8").strip('"\'')
+                        routes.append({
+                            "object": obj,
+                            "method": method.upper(),
+                            "path": path_str
+                        })
         return {"functions": functions, "classes": classes, "routes": routes}
 
     def _save_report(self):
         """
-        Writes the final analysis dictionary to a JSON file.
+        Writes the final analysis dictionary, keyed by relative file path, to a JSON file.
         """
-        report_path = self.project_root / "project_analysis.json"
-        with open(report_path, "w", encoding="utf-8") as f:
-            json.dump(self.analysis, f, indent=4)
+        _write_json_atomic(self.project_root / "project_analysis.json", self.analysis, self.pretty)
 
 
-# ----- Asynchronous Task Queue Components -----
-class BotWorker(threading.Thread):
+def _write_json_atomic(path: Path, data, pretty: bool = False):
     """
-    A background worker that continuously pulls file tasks from a queue,
-    processes them using the scanner’s _process_file method, and stores results.
+    Serializes data as JSON (compact unless pretty; via orjson when installed) into a
+    temporary file next to path, then renames it over path so readers never see a
+    partially written file.
     """
-    def __init__(self, task_queue: queue.Queue, results_list: list, scanner: ProjectScanner, status_callback=None):
-        threading.Thread.__init__(self)
-        self.task_queue = task_queue
-        self.results_list = results_list
-        self.scanner = scanner
-        self.status_callback = status_callback
-        self.daemon = True
-        self.start()
-
-    def run(self):
-        while True:
-            file_path = self.task_queue.get()
-            if file_path is None:
-                break
-            result = self.scanner._process_file(file_path)
-            if result is not None:
-                self.results_list.append(result)
-            if self.status_callback:
-                self.status_callback(file_path, result)
-            self.task_queue.task_done()
-
-
-class MultibotManager:
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0)
+    else:
+        payload = json.dumps(data, indent=4 if pretty else None,
+                             separators=None if pretty else (",", ":")).encode("utf-8")
+    tmp_path = path.with_name(path.name + ".tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, path)
+
+
+def _chunked(iterable, size: int):
+    """Yields lists of up to size consecutive items from iterable."""
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ----- Route Detection Helpers -----
+# Decorator / method names treated as route registrations (Flask/FastAPI style and Express style)
+_ROUTE_VERBS = frozenset({"route", "get", "post", "put", "delete", "patch"})
+_EXPRESS_ROUTE_VERBS = frozenset({"get", "post", "put", "delete", "patch"})
+
+
+def _is_str_constant(node) -> bool:
+    return type(node) is ast.Constant and type(node.value) is str
+
+
+def _decorator_routes(function_name: str, decorator: ast.Call) -> list:
+    """
+    Returns the routes registered by a call decorator such as @app.route("/x", methods=["GET"])
+    or @router.get("/x"), or [] if the decorator is not a route.
+    """
+    func = decorator.func
+    if type(func) is not ast.Attribute:
+        return []
+    func_attr = func.attr.lower()
+    if func_attr not in _ROUTE_VERBS:
+        return []
+    path_arg = "/unknown"
+    methods = [func_attr.upper()]
+    if decorator.args and _is_str_constant(decorator.args[0]):
+        path_arg = decorator.args[0].value
+    for kw in decorator.keywords:
+        if kw.arg == "methods" and type(kw.value) is ast.List:
+            extracted_methods = [elt.value.upper() for elt in kw.value.elts if _is_str_constant(elt)]
+            if extracted_methods:
+                methods = extracted_methods
+    return [{"function": function_name, "method": m, "path": path_arg} for m in methods]
+
+
+# ----- tree-sitter Helpers -----
+def _query_captures(query, node):
     """
-    Manages a pool of BotWorker threads.
+    Returns a query's (node, capture_name) pairs in document order. Newer py-tree-sitter
+    releases group captures into a {name: [nodes]} dict; those are flattened and re-sorted.
     """
-    def __init__(self, scanner: ProjectScanner, num_workers=4, status_callback=None):
-        self.task_queue = queue.Queue()
-        self.results_list = []
-        self.scanner = scanner
-        self.status_callback = status_callback
-        self.workers = [
-            BotWorker(self.task_queue, self.results_list, scanner, status_callback)
-            for _ in range(num_workers)
-        ]
+    captures = query.captures(node)
+    if isinstance(captures, dict):
+        captures = sorted(
+            ((captured, name) for name, nodes in captures.items() for captured in nodes),
+            key=lambda capture: capture[0].start_byte,
+        )
+    return captures
+
+
+# ----- Process Pool Workers -----
+# Each worker process builds its own scanner (and tree-sitter parsers) once, in the pool initializer.
+_worker_scanner = None
+
 
-    def add_task(self, file_path: Path):
-        self.task_queue.put(file_path)
+def _init_worker(project_root: Path):
+    global _worker_scanner
+    _worker_scanner = ProjectScanner(project_root, load_cache=False)
 
-    def wait_for_completion(self):
-        self.task_queue.join()
 
-    def stop_workers(self):
-        for _ in self.workers:
-            self.task_queue.put(None)
+def _process_file_task(task) -> Union[Dict, None]:
+    """Process-pool entry point: analyzes one (file_path, relative_path) task."""
+    file_path, relative_path = task
+    return _worker_scanner._process_file(file_path, relative_path)
 
 
 # ----- Interactive Entry Point -----
@@ -483,7 +685,8 @@ if __name__ == "__main__":
     project_root = input("Enter the project root directory to scan (default '.'): ").strip() or "."
     ignore_input = input("Enter additional directories to ignore (comma separated, or leave empty): ").strip()
     additional_ignore_dirs = {d.strip() for d in ignore_input.split(",") if d.strip()} if ignore_input else set()
+    pretty = input("Write indented, human-readable JSON? (y/N): ").strip().lower() == "y"
 
-    scanner = ProjectScanner(project_root=project_root)
+    scanner = ProjectScanner(project_root=project_root, pretty=pretty)
     scanner.additional_ignore_dirs = additional_ignore_dirs
     scanner.scan_project()
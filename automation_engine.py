@@ -1,7 +1,12 @@
+import io
 import os
+import time
+import asyncio
 import shutil
 import logging
-import json
+import threading
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from webdriver_manager.chrome import ChromeDriverManager
 
@@ -15,12 +20,67 @@ from local_llm_engine import LocalLLMEngine
 # ------------------------------
 # Logger Setup (with UTF-8 encoding)
 # ------------------------------
+LOG_BUFFER_SIZE = 256 * 1024
+LOG_FLUSH_INTERVAL = 1.0  # seconds
+
+
+class BufferedLogHandler(logging.StreamHandler):
+    """
+    StreamHandler over a log file opened with a LOG_BUFFER_SIZE write buffer. Instead of
+    flushing after every record it flushes when an ERROR (or worse) is logged or when
+    LOG_FLUSH_INTERVAL has passed; a deferred flush is armed on a timer so records still
+    reach the file when nothing else is logged for a while (e.g. during a long LLM call).
+    close() writes out the rest (logging's atexit hook closes every handler on exit).
+    """
+    def __init__(self, filename, encoding="utf-8", buffer_size=LOG_BUFFER_SIZE):
+        raw = open(filename, "ab", buffering=buffer_size)
+        super().__init__(io.TextIOWrapper(raw, encoding=encoding, write_through=False))
+        self._last_flush = time.monotonic()
+        self._urgent = False
+        self._timer = None  # pending deferred flush
+
+    def emit(self, record):
+        self._urgent = record.levelno >= logging.ERROR
+        super().emit(record)
+
+    def flush(self, force=False):
+        now = time.monotonic()
+        if force or self._urgent or now - self._last_flush >= LOG_FLUSH_INTERVAL:
+            super().flush()
+            self._last_flush = now
+        elif self._timer is None:
+            self._timer = threading.Timer(LOG_FLUSH_INTERVAL, self._timed_flush)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _timed_flush(self):
+        self.acquire()
+        try:
+            self._timer = None
+            self.flush(force=True)
+        finally:
+            self.release()
+
+    def close(self):
+        self.acquire()
+        try:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if self.stream is not None:
+                self.stream.close()  # flushes the text and byte buffers
+                self.stream = None
+        finally:
+            self.release()
+            super().close()
+
+
 log_file = "automation_engine.log"
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(message)s",
     handlers=[
-        logging.FileHandler(log_file, encoding='utf-8'),
+        BufferedLogHandler(log_file),
         logging.StreamHandler()
     ]
 )
@@ -32,19 +92,89 @@ logger = logging.getLogger(__name__)
 DEPLOY_FOLDER = Path("deployed")
 BACKUP_FOLDER = Path("backups")
 
+# Files process_all_files sends to the local model server at once. Ollama runs
+# OLLAMA_NUM_PARALLEL requests per model concurrently; more workers would only queue there.
+LLM_WORKERS = int(os.environ.get("OLLAMA_NUM_PARALLEL") or 2)
+
 DEPLOY_FOLDER.mkdir(exist_ok=True)
 BACKUP_FOLDER.mkdir(exist_ok=True)
 
+def read_source(file_path):
+    """
+    Read a UTF-8 source file into a bytearray sized from fstat with a single readinto(),
+    then decode it once, skipping TextIOWrapper's chunked decoding. Newlines are
+    normalized to "\n" as text-mode reads do.
+    """
+    with open(file_path, "rb", buffering=0) as f:
+        buf = bytearray(os.fstat(f.fileno()).st_size)
+        n = f.readinto(buf)
+        del buf[n:]
+        buf += f.read()  # anything a short read missed, or appended since fstat
+    text = buf.decode("utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
 # ------------------------------
 # Automation Engine Class
 # ------------------------------
 class AutomationEngine:
-    def __init__(self, use_local_llm=True, model_name='mistral'):
+    def __init__(self, use_local_llm=True, model_name='mistral', lightweight=False):
+        """
+        :param lightweight: Only load the model registry and the local LLM engine, skipping the
+                            ChromeDriver check and the project scan (used by process_all_files
+                            pool workers). Requires use_local_llm.
+        """
+        if lightweight and not use_local_llm:
+            raise ValueError("A lightweight engine only supports the local LLM.")
         logger.info("🚀 Initializing Automation Engine...")
         self.use_local_llm = use_local_llm
         self.model_name = model_name
 
         # Ensure ChromeDriver is available
+        if not lightweight:
+            self._ensure_chromedriver()
+
+        # Instantiate ModelRegistry and retrieve the registry
+        self._load_model_registry()
+
+        # Instantiate LLM Driver: Either Local or OpenAI
+        if self.use_local_llm:
+            self._init_local_llm()
+        else:
+            try:
+                self.openai_client = OpenAIClient(
+                    profile_dir=PROFILE_DIR,
+                    headless=CHATGPT_HEADLESS,
+                    driver_path=CHROMEDRIVER_PATH
+                )
+                if not self.openai_client.login_openai():
+                    logger.error("❌ OpenAI Login Failed.")
+                    raise Exception("OpenAI Login Failed.")
+                self.driver = self.openai_client.driver
+                logger.info("✅ OpenAI session established via OpenAIClient.")
+            except Exception as e:
+                logger.error(f"❌ OpenAIClient initialization error: {e}")
+                raise
+
+        if lightweight:
+            self.project_analysis = {}
+            return
+
+        # Run ProjectScanner to load project analysis. The scan is incremental (unchanged files
+        # are neither re-read nor re-parsed) and its in-memory result is the report, so the
+        # JSON it writes for other tools is not parsed back here.
+        try:
+            scanner = ProjectScanner(project_root=".")
+            scanner.scan_project()
+            self.project_analysis = scanner.analysis
+            logger.info(f"✅ Project analysis loaded successfully ({len(self.project_analysis)} files).")
+        except Exception as e:
+            logger.error(f"❌ Error running ProjectScanner: {e}")
+            self.project_analysis = {}
+
+    def _ensure_chromedriver(self):
         global CHROMEDRIVER_PATH
         if not os.path.exists(CHROMEDRIVER_PATH):
             logger.warning(f"❌ ChromeDriver not found at {CHROMEDRIVER_PATH}")
@@ -69,7 +199,8 @@ class AutomationEngine:
                 logger.error(f"❌ Failed to download ChromeDriver: {e}")
                 raise FileNotFoundError(f"ChromeDriver not found and download failed: {e}")
 
-        # Instantiate ModelRegistry and retrieve the registry
+
+    def _load_model_registry(self):
         try:
             model_reg_instance = ModelRegistry()
             self.model_registry = model_reg_instance.get_registry()
@@ -79,46 +210,17 @@ class AutomationEngine:
         except Exception as e:
             logger.error(f"❌ Model registry initialization error: {e}")
             raise
+        # select_model runs once per file; sort by descending threshold once here
+        self._sorted_models = sorted(self.model_registry.items(), key=lambda kv: -kv[1]['threshold'])
+        self._thresholds = [(name, meta['threshold']) for name, meta in self._sorted_models]
 
-        # Instantiate LLM Driver: Either Local or OpenAI
-        if self.use_local_llm:
-            try:
-                self.driver = LocalLLMEngine(model=self.model_name)
-                logger.info(f"✅ Local LLM engine initialized with model: {self.model_name}")
-            except Exception as e:
-                logger.error(f"❌ Local LLM engine initialization error: {e}")
-                raise
-        else:
-            try:
-                self.openai_client = OpenAIClient(
-                    profile_dir=PROFILE_DIR,
-                    headless=CHATGPT_HEADLESS,
-                    driver_path=CHROMEDRIVER_PATH
-                )
-                if not self.openai_client.login_openai():
-                    logger.error("❌ OpenAI Login Failed.")
-                    raise Exception("OpenAI Login Failed.")
-                self.driver = self.openai_client.driver
-                logger.info("✅ OpenAI session established via OpenAIClient.")
-            except Exception as e:
-                logger.error(f"❌ OpenAIClient initialization error: {e}")
-                raise
-
-        # Run ProjectScanner to load project analysis
+    def _init_local_llm(self):
         try:
-            scanner = ProjectScanner(project_root=".")
-            scanner.scan_project()
-            analysis_path = Path("project_analysis.json")
-            if analysis_path.exists():
-                with open(analysis_path, "r", encoding="utf-8") as f:
-                    self.project_analysis = json.load(f)
-                logger.info("✅ Project analysis loaded successfully.")
-            else:
-                logger.warning("⚠️ No project analysis report found.")
-                self.project_analysis = {}
+            self.driver = LocalLLMEngine(model=self.model_name)
+            logger.info(f"✅ Local LLM engine initialized with model: {self.model_name}")
         except Exception as e:
-            logger.error(f"❌ Error running ProjectScanner: {e}")
-            self.project_analysis = {}
+            logger.error(f"❌ Local LLM engine initialization error: {e}")
+            raise
 
     def get_chatgpt_response(self, prompt):
         """Unified call to LLM"""
@@ -139,8 +241,9 @@ class AutomationEngine:
             if not self.use_local_llm and hasattr(self, "openai_client"):
                 self.openai_client.shutdown()
                 logger.info("✅ OpenAIClient driver shut down successfully.")
-            else:
-                logger.info("✅ Local LLM engine does not require shutdown.")
+            elif hasattr(self, "driver"):
+                self.driver.close()
+                logger.info("✅ Local LLM engine session closed.")
         except Exception as e:
             logger.error(f"❌ Error shutting down driver: {e}")
 
@@ -153,8 +256,7 @@ class AutomationEngine:
             return None
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                file_content = f.read()
+            file_content = read_source(file_path)
         except Exception as e:
             logger.error(f"❌ Failed to read file {file_path}: {e}")
             return None
@@ -229,8 +331,7 @@ class AutomationEngine:
             return None
 
         try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                file_content = f.read()
+            file_content = read_source(file_path)
         except Exception as e:
             logger.error(f"❌ Failed to read file {file_path}: {e}")
             return None
@@ -257,11 +358,14 @@ class AutomationEngine:
         Dynamically select the model based on line count.
         (Extend this to consider file complexity if desired.)
         """
-        lines = len(file_content.strip().splitlines())
+        # Count newlines in C instead of building a list of lines; surrounding
+        # blank lines are stripped first so they don't count
+        stripped = file_content.strip()
+        lines = stripped.count("\n") + 1 if stripped else 0
         logger.info(f"📏 File has {lines} lines.")
-        # Sort registry items by descending threshold value
-        for model_name, meta in sorted(self.model_registry.items(), key=lambda x: -x[1]['threshold']):
-            if lines >= meta["threshold"]:
+        # Thresholds are pre-sorted in descending order, so the first match wins
+        for model_name, threshold in self._thresholds:
+            if lines >= threshold:
                 return model_name
         logger.warning("⚠️ No matching model found. Defaulting to first available model.")
         return next(iter(self.model_registry))
@@ -283,7 +387,9 @@ class AutomationEngine:
         deploy_path = DEPLOY_FOLDER / Path(file_path).name
         logger.info(f"📦 Deploying file: {file_path}")
         try:
-            shutil.copy2(file_path, backup_path)
+            # Contents only: copyfile uses the kernel fast path (sendfile) and backups
+            # of generated files do not need the source's metadata
+            shutil.copyfile(file_path, backup_path)
             shutil.move(file_path, deploy_path)
             logger.info(f"✅ Deployed to: {deploy_path}")
             logger.info(f"🗄️ Backup saved at: {backup_path}")
@@ -320,8 +426,7 @@ class AutomationEngine:
                 continue
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    file_content = f.read()
+                file_content = read_source(file_path)
             except Exception as e:
                 logger.error(f"❌ Failed to read {file_path}: {e}")
                 results[file_path] = None
@@ -373,18 +478,69 @@ class AutomationEngine:
 
         return results
 
-    def process_all_files(self):
-        """Process all files, prioritized by complexity."""
+    def process_all_files(self, max_workers=LLM_WORKERS):
+        """
+        Process all files, prioritized by complexity.
+        With a local LLM the files are dispatched to a pool of max_workers processes; each
+        worker builds its own lightweight engine, so that many requests reach the model
+        server concurrently. The OpenAI browser session cannot be shared, so that mode stays serial.
+        Returns {file path: process_file's result}, i.e. the *_refactored.py path the output
+        was written to (deploy_file has already moved it into DEPLOY_FOLDER), or None when
+        the file was not deployed.
+        """
         files = self.prioritize_files()
-        for file_path in files:
-            self.process_file(file_path)
+        if not self.use_local_llm or len(files) < 2:
+            return {file_path: self.process_file(file_path) for file_path in files}
+
+        # Buffered log records must reach the file before fork copies the buffer into workers
+        _flush_logs()
+        with ProcessPoolExecutor(max_workers=max_workers,
+                                 initializer=_init_worker, initargs=(self.driver.model,)) as executor:
+            return dict(zip(files, executor.map(_process_file_task, files)))
 
     def ask_question_in_history(self, question, **kwargs):
-        """Iterate through every ChatGPT conversation and ask *question* (OpenAI mode only)."""
+        """
+        Iterate through every ChatGPT conversation and ask *question* (OpenAI mode only).
+        Runs OpenAIClient.iterate_conversations_async on the main browser; pass concurrency=N to
+        work on N conversations at once with extra browsers.
+        """
         if self.use_local_llm or not hasattr(self, "openai_client"):
             logger.error("❌ Conversation iteration requires OpenAIClient (set use_local_llm=False).")
             return {}
-        return self.openai_client.iterate_conversations(question, **kwargs)
+        return asyncio.run(self.openai_client.iterate_conversations_async(question, **kwargs))
+
+# ------------------------------
+# Process Pool Workers
+# ------------------------------
+_worker_engine = None
+_worker_model_name = None
+
+
+def _init_worker(model_name):
+    global _worker_model_name
+    _worker_model_name = model_name
+
+
+def _process_file_task(file_path):
+    """Runs process_file in a pool worker; the worker's engine is created on first use."""
+    global _worker_engine
+    try:
+        if _worker_engine is None:
+            _worker_engine = AutomationEngine(model_name=_worker_model_name, lightweight=True)
+            # Pool workers skip atexit hooks but run multiprocessing finalizers on exit
+            multiprocessing.util.Finalize(None, _worker_engine.driver.close, exitpriority=10)
+        return _worker_engine.process_file(file_path)
+    finally:
+        # Pool workers exit without running atexit hooks, so flush after every file
+        _flush_logs()
+
+
+def _flush_logs():
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, BufferedLogHandler):
+            handler.flush(force=True)
+        else:
+            handler.flush()
 
 # ------------------------------
 # Entry Point
@@ -1,6 +1,8 @@
 import time
 import threading
 import queue
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from OpenAIClient import OpenAIClient
 from setup_logging import setup_logging
 
@@ -10,33 +12,128 @@ logger = setup_logging("bot_worker", log_dir="logs/social")
 TASKS_BEFORE_REVALIDATE = 5
 LOGIN_RETRY_ATTEMPTS = 3
 LOGIN_RETRY_DELAY = 5  # seconds between retry attempts
+BOT_HEADLESS = False
+PREWARM_TASKS_AHEAD = 1  # start warming the spare browser this many tasks before revalidating
+POOL_CHECKOUT_TIMEOUT = 30  # seconds to wait for a spare that is still warming up
+SPARE_PROFILE_SUFFIX = "_spare"
 
-class BotWorker(threading.Thread):
+def _queue_size(q):
+    """qsize() for logging; multiprocessing queues cannot report it on macOS."""
+    try:
+        return q.qsize()
+    except NotImplementedError:
+        return "?"
+
+
+class ClientPool:
     """
-    A threaded worker that processes tasks using OpenAIClient.
-    Handles login sessions, periodic revalidation, and task execution.
+    One pre-warmed, logged-in spare OpenAIClient for a bot, so revalidating swaps browsers
+    instead of waiting for a cold Chrome start. The spare is built with the bot's settings,
+    but since a live Chrome profile directory cannot be opened twice it runs from a twin of
+    the bot's profile (profile_dir + SPARE_PROFILE_SUFFIX); bot and spare trade directories
+    on every swap.
+
+    prewarm(active) starts a spare in the background on the directory the active client is
+    not using; checkout() hands it out, waiting if it is still warming; recycle(client) saves
+    the stale client's cookies and quits it. Warming and retiring run one at a time on a
+    single background thread, so a directory is always released before it is reused.
     """
-    def __init__(self, bot_id, profile_dir, task_queue: queue.Queue, results_queue: queue.Queue, status_callback=None):
-        super().__init__()
-        self.name = f"Bot-{bot_id}"
-        self.profile_dir = profile_dir
-        self.task_counter = 0
-        self.task_queue = task_queue
-        self.results_queue = results_queue
-        self.status_callback = status_callback
-        self._shutdown = threading.Event()
-        self.daemon = True  # Ensures the worker stops when the main program exits
+    def __init__(self, profile_dir, headless=BOT_HEADLESS, driver_path=None):
+        self.headless = headless
+        self.driver_path = driver_path
+        self._profiles = (profile_dir, profile_dir + SPARE_PROFILE_SUFFIX if profile_dir else None)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ClientPool")
+        self._spare = None  # Future of the spare being warmed (result: client or None)
+        self._lock = threading.Lock()
+        self._closed = False
 
-        logger.info(f"[{self.name}] 🚀 Instantiating OpenAIClient (Profile: {self.profile_dir})")
-        self.openai_client = OpenAIClient(profile_dir=self.profile_dir, headless=False)
+    def prewarm(self, active):
+        """Start warming a spare for the bot whose current client is active (no-op if one exists)."""
+        with self._lock:
+            if self._closed or self._spare is not None:
+                return
+            profile_dir = self._profiles[1] if active.profile_dir == self._profiles[0] else self._profiles[0]
+            self._spare = self._executor.submit(self._warm, profile_dir)
 
-        if not self._login_with_retries():
-            logger.error(f"[{self.name}] ❌ Failed login after retries. Worker shutting down.")
-            self.shutdown()
-            raise Exception(f"{self.name}: Login failed!")
+    def _warm(self, profile_dir):
+        client = None
+        try:
+            client = OpenAIClient(profile_dir=profile_dir, headless=self.headless, driver_path=self.driver_path)
+            # No login_openai(): a spare must never stop for a manual login
+            if client.is_logged_in() or (client.load_openai_cookies() and client.is_logged_in()):
+                return client
+            logger.warning("⚠️ Pre-warmed client could not log in with the saved cookies; discarding it.")
+        except Exception as e:
+            logger.error(f"❌ Failed to pre-warm OpenAIClient: {e}")
+        if client is not None:
+            client.shutdown()
+        return None
 
-        logger.info(f"[{self.name}] ✅ Login successful. Ready to process tasks!")
-        self.start()
+    def checkout(self, timeout=POOL_CHECKOUT_TIMEOUT):
+        """
+        Returns the logged-in spare, or None if none was started, it failed to log in, or it
+        is still warming after timeout seconds (it is then kept for the next checkout).
+        """
+        with self._lock:
+            spare = self._spare
+        if spare is None:
+            return None
+        try:
+            client = spare.result(timeout=timeout)
+        except FutureTimeoutError:
+            return None
+        with self._lock:
+            self._spare = None
+        return client
+
+    def recycle(self, client):
+        """Retire a stale client in the background, releasing its profile directory."""
+        def retire():
+            try:
+                client.save_openai_cookies()  # keep the cookie jar spares log in with fresh
+            finally:
+                client.shutdown()
+
+        self._executor.submit(retire)
+
+    def close(self):
+        """Quit the spare (once it finishes warming) and stop the background thread."""
+        with self._lock:
+            self._closed = True
+            spare, self._spare = self._spare, None
+        if spare is not None:
+            spare.add_done_callback(lambda future: future.result() and future.result().shutdown())
+        self._executor.shutdown(wait=False)
+
+
+class _BotTaskLoop:
+    """
+    Task loop shared by BotWorker (thread) and BotProcess (process): login retries,
+    task execution, periodic session revalidation. Subclasses provide self.name,
+    self.openai_client, self._shutdown, the task/results queues, and either a status_queue
+    (processes) or a status_callback (threads) for status updates; the other is None.
+
+    Each bot keeps its spare client for revalidation in its own ClientPool (self._client_pool,
+    created on first use).
+    """
+    def _new_client(self, profile_dir=None):
+        return OpenAIClient(profile_dir=profile_dir or self.profile_dir, headless=BOT_HEADLESS)
+
+    def _get_client_pool(self):
+        if self._client_pool is None:
+            self._client_pool = ClientPool(self.profile_dir, headless=BOT_HEADLESS)
+        return self._client_pool
+
+    def _close_client_pool(self):
+        if self._client_pool is not None:
+            self._client_pool.close()
+
+    def _report_status(self, update_type, payload):
+        """Send an (update_type, payload) status update to the manager."""
+        if self.status_queue is not None:
+            self.status_queue.put((update_type, payload))
+        elif self.status_callback:
+            self.status_callback(update_type, payload)
 
     def _login_with_retries(self):
         """
@@ -52,12 +149,11 @@ class BotWorker(threading.Thread):
         logger.error(f"[{self.name}] ❌ All login attempts failed.")
         return False
 
-    def run(self):
+    def _serve_tasks(self):
         """
         Main loop: fetch tasks, process them, update results,
         and revalidate the session periodically.
         """
-        logger.info(f"[{self.name}] ▶️ Worker thread started.")
         while not self._shutdown.is_set():
             try:
                 task = self.task_queue.get(timeout=1)
@@ -75,35 +171,33 @@ class BotWorker(threading.Thread):
                 success, result = self.process_task(task)
                 self.results_queue.put((task, result))
 
-                if self.status_callback:
-                    update_type = "progress" if success else "error"
-                    self.status_callback(update_type, {
-                        "worker": self.name,
-                        "task": task,
-                        "result": result
-                    })
+                self._report_status("progress" if success else "error", {
+                    "worker": self.name,
+                    "task": task,
+                    "result": result
+                })
 
             except Exception as e:
                 logger.exception(f"[{self.name}] ❌ Exception during task execution.")
                 self.results_queue.put((task, {"error": str(e)}))
 
-                if self.status_callback:
-                    self.status_callback("error", {
-                        "worker": self.name,
-                        "task": task,
-                        "error": str(e)
-                    })
+                self._report_status("error", {
+                    "worker": self.name,
+                    "task": task,
+                    "error": str(e)
+                })
 
             finally:
                 self.task_queue.task_done()
 
             self.task_counter += 1
-            logger.info(f"[{self.name}] ✅ Task #{self.task_counter} complete. Queue size: {self.task_queue.qsize()}")
+            logger.info(f"[{self.name}] ✅ Task #{self.task_counter} complete. Queue size: {_queue_size(self.task_queue)}")
 
             if self.task_counter % TASKS_BEFORE_REVALIDATE == 0:
                 self._revalidate_session()
-
-        logger.info(f"[{self.name}] 🛑 Worker thread exiting.")
+            elif (self.task_counter + PREWARM_TASKS_AHEAD) % TASKS_BEFORE_REVALIDATE == 0:
+                # Warm the spare shortly before it is needed, not for the bot's whole lifetime
+                self._get_client_pool().prewarm(self.openai_client)
 
     def process_task(self, prompt):
         """
@@ -145,21 +239,76 @@ class BotWorker(threading.Thread):
         logger.info(f"[{self.name}] 🔄 Revalidating OpenAI session after {self.task_counter} tasks.")
         revalidate_start = time.time()
 
+        pool = self._get_client_pool()
+        replacement = pool.checkout()
+        if replacement is not None:
+            stale, self.openai_client = self.openai_client, replacement
+            pool.recycle(stale)
+            elapsed_revalidate = time.time() - revalidate_start
+            logger.info(f"[{self.name}] ✅ Swapped in a pre-warmed session in {elapsed_revalidate:.2f}s.")
+            return
+
+        # No spare available: restart the browser and log in again. Reopen the stale client's
+        # own directory; after a swap the other one may belong to a spare that is still warming.
+        logger.warning(f"[{self.name}] ⚠️ No pre-warmed session available; restarting the session.")
+        profile_dir = self.openai_client.profile_dir
         self.openai_client.shutdown()
+        try:
+            self.openai_client = self._new_client(profile_dir)
+        except Exception as e:
+            logger.error(f"[{self.name}] ❌ Could not restart OpenAIClient: {e}. Worker shutting down.")
+            self.shutdown()
+            return
 
         if not self._login_with_retries():
-            logger.error(f"[{self.name}] ❌ Revalidation failed after shutdown. Worker shutting down.")
+            logger.error(f"[{self.name}] ❌ Revalidation failed. Worker shutting down.")
             self.shutdown()
         else:
             elapsed_revalidate = time.time() - revalidate_start
             logger.info(f"[{self.name}] ✅ Revalidation complete in {elapsed_revalidate:.2f}s.")
 
+
+class BotWorker(_BotTaskLoop, threading.Thread):
+    """
+    A threaded worker that processes tasks using OpenAIClient.
+    Handles login sessions, periodic revalidation, and task execution.
+    """
+    def __init__(self, bot_id, profile_dir, task_queue: queue.Queue, results_queue: queue.Queue, status_callback=None):
+        super().__init__()
+        self.name = f"Bot-{bot_id}"
+        self.profile_dir = profile_dir
+        self.task_counter = 0
+        self.task_queue = task_queue
+        self.results_queue = results_queue
+        self.status_callback = status_callback
+        self.status_queue = None
+        self._shutdown = threading.Event()
+        self.daemon = True  # Ensures the worker stops when the main program exits
+
+        logger.info(f"[{self.name}] 🚀 Instantiating OpenAIClient (Profile: {self.profile_dir})")
+        self._client_pool = None
+        self.openai_client = self._new_client()
+
+        if not self._login_with_retries():
+            logger.error(f"[{self.name}] ❌ Failed login after retries. Worker shutting down.")
+            self.shutdown()
+            raise Exception(f"{self.name}: Login failed!")
+
+        logger.info(f"[{self.name}] ✅ Login successful. Ready to process tasks!")
+        self.start()
+
+    def run(self):
+        logger.info(f"[{self.name}] ▶️ Worker thread started.")
+        self._serve_tasks()
+        logger.info(f"[{self.name}] 🛑 Worker thread exiting.")
+
     def shutdown(self):
         """
         Gracefully shut down the worker and its OpenAIClient session.
         """
         logger.info(f"[{self.name}] 🛑 Initiating shutdown sequence...")
         self._shutdown.set()
+        self._close_client_pool()
 
         if self.openai_client:
             try:
@@ -167,3 +316,60 @@ class BotWorker(threading.Thread):
                 logger.info(f"[{self.name}] ✅ OpenAIClient shut down successfully.")
             except Exception as e:
                 logger.error(f"[{self.name}] ❌ Error shutting down OpenAIClient: {e}")
+
+
+class BotProcess(_BotTaskLoop, multiprocessing.Process):
+    """
+    A worker process that processes tasks using OpenAIClient, so bots run in parallel
+    instead of contending for one interpreter's GIL. Same task loop, login retries and
+    revalidation as BotWorker, but the OpenAIClient (and its Selenium driver, which cannot
+    be pickled) is created inside run(), in the child process.
+
+    Queues must be multiprocessing queues (task_queue a JoinableQueue). Status updates are
+    sent to status_queue as (update_type, payload) tuples for the parent to consume.
+    Unlike BotWorker, login happens after start(); if the client cannot be started or
+    logged in, a "fatal" status update is sent and the process ends.
+    """
+    def __init__(self, bot_id, profile_dir, task_queue, results_queue, status_queue=None):
+        super().__init__(name=f"Bot-{bot_id}", daemon=True)
+        self.profile_dir = profile_dir
+        self.task_counter = 0
+        self.task_queue = task_queue
+        self.results_queue = results_queue
+        self.status_queue = status_queue
+        self.status_callback = None
+        self._shutdown = multiprocessing.Event()
+        self.openai_client = None
+        self._client_pool = None
+
+    def run(self):
+        try:
+            logger.info(f"[{self.name}] 🚀 Instantiating OpenAIClient (Profile: {self.profile_dir})")
+            self.openai_client = self._new_client()
+            if not self._login_with_retries():
+                logger.error(f"[{self.name}] ❌ Failed login after retries. Worker shutting down.")
+                self._report_status("fatal", {"worker": self.name, "error": "Login failed after retries"})
+                return
+            logger.info(f"[{self.name}] ✅ Login successful. Ready to process tasks!")
+            self._serve_tasks()
+        except Exception as e:
+            logger.exception(f"[{self.name}] ❌ Worker process failed.")
+            self._report_status("fatal", {"worker": self.name, "error": str(e)})
+        finally:
+            self._shutdown.set()
+            self._close_client_pool()
+            if self.openai_client is not None:
+                try:
+                    self.openai_client.shutdown()
+                    logger.info(f"[{self.name}] ✅ OpenAIClient shut down successfully.")
+                except Exception as e:
+                    logger.error(f"[{self.name}] ❌ Error shutting down OpenAIClient: {e}")
+            logger.info(f"[{self.name}] 🛑 Worker process exiting.")
+
+    def shutdown(self):
+        """
+        Ask the worker to stop after its current task. Safe to call from the parent or the
+        worker itself; the OpenAIClient is shut down in the worker as run() exits.
+        """
+        logger.info(f"[{self.name}] 🛑 Initiating shutdown sequence...")
+        self._shutdown.set()
@@ -1,4 +1,5 @@
 import argparse
+import asyncio
 import os
 import sys
 import time
@@ -18,6 +19,9 @@ def parse_args():
                         help="Maximum number of conversation threads to process (default: all).")
     parser.add_argument("--delay", type=int, default=3,
                         help="Seconds to wait after opening a conversation before sending the prompt (default: 3).")
+    parser.add_argument("--concurrency", type=int, default=1,
+                        help="Conversations processed at once; each one beyond the first opens another browser "
+                             "logged in from the saved cookies (default: 1, a single browser).")
     parser.add_argument("--headless", action="store_true",
                         help="Launch Chrome in headless mode (overrides CHATGPT_HEADLESS config).")
     parser.add_argument("--driver-path", type=str, default=CHROMEDRIVER_PATH,
@@ -46,16 +50,17 @@ def main():
         client.shutdown()
         sys.exit(1)
 
-    results = client.iterate_conversations(
+    results = asyncio.run(client.iterate_conversations_async(
         question=args.question,
         delay_between=args.delay,
         max_threads=args.max_threads,
-    )
+        concurrency=args.concurrency,
+    ))
 
     # Simple summary output
     output_dir = Path("conversation_queries").resolve()
     print("\n=== SUMMARY ===")
-    print(f"Saved {len(results)} responses to {output_dir}")
+    print(f"Saved {len(results)} responses to {output_dir / 'responses.jsonl'}")
     for conv_id, answer in results.items():
         snippet = (answer[:75] + "…") if answer and len(answer) > 75 else answer
         print(f"- {conv_id}: {snippet}")
@@ -1,17 +1,44 @@
+import json
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# orjson (optional) parses the streamed JSON lines faster than json
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    orjson = None
+    _loads = json.loads
+
+# (connect, read) timeouts in seconds. When streaming, the read timeout bounds the wait
+# for each chunk rather than for the whole generation.
+REQUEST_TIMEOUT = (3, 120)
+STREAM_CHUNK_SIZE = 64 * 1024
 
 class LocalLLMEngine:
     def __init__(self, model='mistral', base_url='http://localhost:11434'):
         self.model = model
         self.base_url = base_url
 
+        # One keep-alive session per engine, so consecutive prompts reuse the connection
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16,
+                              max_retries=Retry(total=3, backoff_factor=0.1))
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+
     def set_model(self, model_name):
         """Switch to a different local model on-the-fly."""
         self.model = model_name
         print(f"✅ Switched to local model: {self.model}")
 
-    def get_response(self, prompt, stream=False):
-        """Send prompt to the local LLM and get a response."""
+    def get_response(self, prompt, stream=True):
+        """
+        Send prompt to the local LLM and get a response.
+        By default the reply is streamed: Ollama sends one JSON object per generated chunk,
+        so no full-response document is buffered server-side or parsed again here.
+        """
         endpoint = f"{self.base_url}/api/generate"
 
         payload = {
@@ -21,12 +48,27 @@ class LocalLLMEngine:
         }
 
         try:
-            response = requests.post(endpoint, json=payload)
-            response.raise_for_status()
-            data = response.json()
+            with self._session.post(endpoint, json=payload, stream=stream, timeout=REQUEST_TIMEOUT) as response:
+                response.raise_for_status()
+                if not stream:
+                    return response.json().get('response', '').strip()
 
-            return data.get('response', '').strip()
+                parts = []
+                for line in response.iter_lines(chunk_size=STREAM_CHUNK_SIZE):
+                    if not line:
+                        continue
+                    chunk = _loads(line)
+                    if 'error' in chunk:
+                        raise RuntimeError(chunk['error'])
+                    parts.append(chunk.get('response', ''))
+                    if chunk.get('done'):
+                        break
+                return ''.join(parts).strip()
 
         except Exception as e:
             print(f"❌ LocalLLMEngine error: {e}")
             return None
+
+    def close(self):
+        """Close the HTTP session and its pooled connections."""
+        self._session.close()